@@ -0,0 +1,87 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, literal, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import (db, Question, Answer, Upvote,
+                    QuestionArchive, AnswerArchive, UpvoteArchive)
+from feed import PAGE_SIZE
+import moderation
+import search
+
+# ---------------------------
+# Semester archiving
+# ---------------------------
+# Questions older than a cutoff move, with their answers and upvotes, into
+# the *_archive tables: INSERT ... SELECT into the archive and a set-based
+# delete from the live tables (moderation.py) in one transaction per chunk,
+# so the live tables shrink steadily and a crash never loses or duplicates a
+# row. Archived questions are browsed and searched read-only at /archive.
+# Run with: flask --app app archive --before 2024-06-01 --semester 2023-24
+
+CHUNK_SIZE = 1000
+ARCHIVE_AFTER_DAYS = 180
+
+
+def default_cutoff():
+    return datetime.utcnow() - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+
+def _archive_chunk(question_ids, semester, archived_at):
+    answer_ids = select(Answer.answer_ID).where(Answer.question_ID.in_(question_ids))
+    db.session.execute(insert(QuestionArchive).from_select(
+        ['question_ID', 'title', 'description', 'created_at', 'student_ID', 'subject_ID',
+         'is_answered', 'semester', 'archived_at'],
+        select(Question.question_ID, Question.title, Question.description, Question.created_at,
+               Question.student_ID, Question.subject_ID, Question.is_answered,
+               literal(semester), literal(archived_at))
+        .where(Question.question_ID.in_(question_ids))))
+    db.session.execute(insert(AnswerArchive).from_select(
+        ['answer_ID', 'question_ID', 'faculty_ID', 'content', 'created_at', 'upvote_count'],
+        select(Answer.answer_ID, Answer.question_ID, Answer.faculty_ID, Answer.content,
+               Answer.created_at, Answer.upvote_count)
+        .where(Answer.question_ID.in_(question_ids))))
+    db.session.execute(insert(UpvoteArchive).from_select(
+        ['upvote_ID', 'answer_ID', 'user_ID'],
+        select(Upvote.upvote_ID, Upvote.answer_ID, Upvote.user_ID)
+        .where(Upvote.answer_ID.in_(answer_ids))))
+    # Also drops the search rows and bumps each subject's content version
+    return moderation.delete_questions(question_ids)
+
+
+def archive_before(cutoff, semester, chunk_size=CHUNK_SIZE, progress=None):
+    """Move every question created before `cutoff` to the archive. Returns rows moved per table."""
+    totals = Counter()
+    archived_at = datetime.utcnow()
+    while True:
+        question_ids = [row[0] for row in db.session.execute(
+            select(Question.question_ID).where(Question.created_at < cutoff)
+            .order_by(Question.question_ID).limit(chunk_size))]
+        if not question_ids:
+            break
+        totals.update(_archive_chunk(question_ids, semester, archived_at))
+        db.session.commit()
+        if progress:
+            progress(totals['question'])
+    if totals:
+        search.invalidate_stats()
+    return dict(totals)
+
+
+# ---------- Read-only access ----------
+def search_archive(query='', subject_id=None, page=1, per_page=PAGE_SIZE):
+    """One page of archived questions, newest first, optionally matching every query term."""
+    q = QuestionArchive.query
+    if subject_id:
+        q = q.filter(QuestionArchive.subject_ID == subject_id)
+    # Plain LIKE per term: the archive is cold and rarely searched, so it
+    # isn't worth keeping in the BM25 index
+    for term in list(dict.fromkeys(search.tokenize(query)))[:search.MAX_QUERY_TERMS]:
+        pattern = f'%{term}%'
+        q = q.filter(or_(QuestionArchive.title.ilike(pattern), QuestionArchive.description.ilike(pattern)))
+    return (q.options(joinedload(QuestionArchive.user),
+                      joinedload(QuestionArchive.subject),
+                      selectinload(QuestionArchive.answers).joinedload(AnswerArchive.user))
+            .order_by(QuestionArchive.created_at.desc(), QuestionArchive.question_ID.desc())
+            .paginate(page=page, per_page=per_page, error_out=False))
@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz variants are built
+    brotli = None
+
+# ---------------------------
+# Static assets and response compression
+# ---------------------------
+# Page CSS/JS lives in static/css and static/js. `flask build-assets` copies
+# each file to static/dist under a content-hash name (all_questions.3f9c2a1b.css)
+# next to pre-compressed .gz/.br variants, and writes manifest.json. Templates
+# link them with asset_url('css/all_questions.css'); /assets/ serves the best
+# variant the browser accepts with a one-year immutable Cache-Control, so a
+# changed file simply gets a new URL. Without a build, asset_url falls back to
+# the source file with ?v=<hash>.
+#
+# HTML responses are gzipped on the way out when the client accepts it.
+
+SOURCE_DIRS = ('css', 'js')
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+HASH_LENGTH = 8
+ASSET_MAX_AGE = 365 * 24 * 3600
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+GZIP_LEVEL = 6
+GZIP_MIN_SIZE = 500  # bytes; smaller bodies aren't worth the header
+COMPRESSIBLE = {'text/html', 'application/json'}
+
+_manifest = None
+_source_hashes = {}
+
+
+def _static_root():
+    return current_app.static_folder
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+
+
+# ---------- Build ----------
+def build(static_root):
+    """Fingerprint and pre-compress every source asset. Returns the manifest."""
+    dist_root = os.path.join(static_root, DIST_DIR)
+    shutil.rmtree(dist_root, ignore_errors=True)
+    manifest = {}
+    for folder in SOURCE_DIRS:
+        source_dir = os.path.join(static_root, folder)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(dist_root, folder), exist_ok=True)
+        for name in sorted(os.listdir(source_dir)):
+            with open(os.path.join(source_dir, name), 'rb') as f:
+                data = f.read()
+            stem, ext = os.path.splitext(name)
+            hashed = f'{folder}/{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}'
+            target = os.path.join(dist_root, hashed)
+            with open(target, 'wb') as f:
+                f.write(data)
+            with open(target + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(target + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+            manifest[f'{folder}/{name}'] = hashed
+    with open(os.path.join(dist_root, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(os.path.join(_static_root(), DIST_DIR, MANIFEST)) as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {}
+    return _manifest
+
+
+def build_id():
+    """Changes whenever the built assets do (part of page ETags)."""
+    return hashlib.sha1(json.dumps(_load_manifest(), sort_keys=True).encode()).hexdigest()[:HASH_LENGTH]
+
+
+# ---------- Template helper ----------
+def asset_url(name):
+    built = _load_manifest().get(name)
+    if built is not None:
+        return url_for('assets', filename=built)
+    # Not built (development): the source file, cache-busted by its hash
+    if name not in _source_hashes:
+        _source_hashes[name] = _digest(os.path.join(_static_root(), name))
+    return url_for('static', filename=name, v=_source_hashes[name])
+
+
+# ---------- Serving ----------
+def serve(filename):
+    dist_root = os.path.join(_static_root(), DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings[encoding] and os.path.exists(os.path.join(dist_root, filename + suffix)):
+            response = send_from_directory(dist_root, filename + suffix, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(dist_root, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.immutable = True
+    return response
+
+
+def _compress(response):
+    if response.mimetype not in COMPRESSIBLE or response.status_code != 200:
+        return response
+    # Streams (/events, exports) and files are left alone
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if not request.accept_encodings['gzip'] or len(data) < GZIP_MIN_SIZE:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def init_app(app):
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve)
+    app.jinja_env.globals['asset_url'] = asset_url
+    app.after_request(_compress)
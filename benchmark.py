@@ -0,0 +1,367 @@
+"""Benchmarks for the page, write, export and admin routes in app.py.
+
+Two parts, both driven through the Flask test client against a throwaway
+database given by DATABASE_URL (it is wiped and re-seeded):
+
+  routes    per-view timings at several dataset sizes
+  scenario  concurrent users doing login -> feed -> upvote -> answer
+  startup   cold start of a fresh worker process (import + create_app)
+
+Per-request query counts come from the Server-Timing header (profiler.py).
+/events is left out: it is a long-lived stream, not a request to time.
+Results are written as JSON and compared against a stored baseline; any
+regression beyond the tolerance exits with status 1.
+
+    DATABASE_URL=sqlite:///bench.db python benchmark.py --sizes 1000 10000 100000
+    DATABASE_URL=sqlite:///bench.db python benchmark.py --save-baseline
+    python benchmark.py --startup-only --startup-target-ms 1000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+# Run in a fresh interpreter; prints seconds spent importing and building the app
+_STARTUP_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from wsgi import app; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+    return {'p50_ms': round(pick(50), 3), 'p95_ms': round(pick(95), 3), 'p99_ms': round(pick(99), 3)}
+
+
+def _timed(client, method, url, **kwargs):
+    start = time.perf_counter()
+    response = client.open(url, method=method, **kwargs)
+    response.get_data()  # streamed bodies (exports) are produced here
+    elapsed = (time.perf_counter() - start) * 1000
+    match = _QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+    return response, elapsed, int(match.group(1)) if match else 0
+
+
+def _login(client, username):
+    response = client.post('/login', data={'username': username, 'password': 'password'})
+    if response.status_code != 302:
+        raise RuntimeError(f'login failed for {username}')
+
+
+def _reset_and_seed(app, questions):
+    from models import db
+    import bulk_import
+    import leaderboard_cache
+    import search
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        bulk_import.seed(departments=4, subjects_per_department=6, students=max(200, questions // 25),
+                         faculty=48, questions=questions)
+        search.rebuild()
+    leaderboard_cache.invalidate()
+
+
+def _fixtures(app):
+    from models import User, Answer, Question, FacultySubject
+    with app.app_context():
+        faculty = User.query.join(FacultySubject, FacultySubject.faculty_ID == User.user_ID).first()
+        students = [u.username for u in User.query.filter_by(role='student').limit(50)]
+        # a student with questions of their own, for my_questions
+        owner_id = Question.query.order_by(Question.question_ID.desc()).first().student_ID
+        owner = User.query.filter_by(user_ID=owner_id).first().username
+        answers = [a.answer_ID for a in Answer.query.order_by(Answer.answer_ID.desc()).limit(500)]
+        question_ids = [q.question_ID for q in Question.query.order_by(Question.question_ID.desc()).limit(500)]
+        subject_id = FacultySubject.query.filter_by(faculty_ID=faculty.user_ID).first().subject_ID
+        return {'faculty': faculty.username, 'students': students, 'owner': owner,
+                'answers': answers, 'questions': question_ids, 'subject_id': subject_id,
+                'department_id': faculty.department_ID}
+
+
+def _write_fixtures(app, fx, repeat):
+    """Rows for the delete/edit cases to use up, and an admin account."""
+    from models import db, User, Question, Announcement
+    with app.app_context():
+        owner = User.query.filter_by(username=fx['owner']).first()
+        faculty = User.query.filter_by(username=fx['faculty']).first()
+        admin = User(username='bench_admin', password_hash=owner.password_hash, role='admin',
+                     department_ID=owner.department_ID, reputation_points=0)
+        db.session.add(admin)
+
+        def questions():
+            rows = [Question(title='Benchmark fixture', description='to be deleted', student_ID=owner.user_ID,
+                             subject_ID=fx['subject_id']) for _ in range(repeat)]
+            db.session.add_all(rows)
+            db.session.flush()
+            return [q.question_ID for q in rows]
+
+        def announcements():
+            rows = [Announcement(faculty_ID=faculty.user_ID, department_ID=faculty.department_ID,
+                                 title='Benchmark fixture', content='to be changed') for _ in range(repeat)]
+            db.session.add_all(rows)
+            db.session.flush()
+            return [a.announcement_ID for a in rows]
+
+        pools = {'own_questions': questions(), 'moderated_questions': questions(),
+                 'edited_announcements': announcements(), 'deleted_announcements': announcements(),
+                 'moderated_announcements': announcements()}
+        db.session.commit()
+    return {**fx, 'admin': 'bench_admin', **{name: iter(ids) for name, ids in pools.items()}}
+
+
+def bench_routes(app, repeat):
+    """Time each view; returns {route: {p50_ms, p95_ms, p99_ms, queries}}."""
+    fx = _write_fixtures(app, _fixtures(app), repeat)
+    student, faculty, admin = app.test_client(), app.test_client(), app.test_client()
+    _login(student, fx['owner'])
+    _login(faculty, fx['faculty'])
+    _login(admin, fx['admin'])
+    voter_pool = iter(fx['students'] * repeat)
+    answer_pool = iter(fx['answers'] * repeat)
+    question_pool = iter(fx['questions'] * repeat)
+
+    feed = student.get('/all_questions').get_data(as_text=True)
+    cursor = re.search(r'cursor=([A-Za-z0-9_\-]+)', feed)
+    page_two = f'/all_questions?cursor={cursor.group(1)}' if cursor else '/all_questions'
+
+    def upvote(client):
+        voter = app.test_client()
+        _login(voter, next(voter_pool))
+        return _timed(voter, 'POST', f'/upvote/{next(answer_pool)}', headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    def logout():
+        client = app.test_client()
+        _login(client, next(voter_pool))
+        return _timed(client, 'GET', '/logout')
+
+    def register():
+        return _timed(app.test_client(), 'POST', '/register', data={
+            'username': f'bench_{random.getrandbits(48):x}', 'password': 'password',
+            'role': 'student', 'department_id': fx['department_id']})
+
+    announcement = {'title': 'Benchmark announcement', 'content': 'timing run'}
+
+    cases = {
+        'home': lambda: _timed(student, 'GET', '/'),
+        'dashboard': lambda: _timed(student, 'GET', '/dashboard'),
+        'all_questions': lambda: _timed(student, 'GET', '/all_questions'),
+        'all_questions_page2': lambda: _timed(student, 'GET', page_two),
+        'all_questions_hot': lambda: _timed(student, 'GET', '/all_questions?sort=hot'),
+        'my_questions': lambda: _timed(student, 'GET', '/my_questions'),
+        'search': lambda: _timed(student, 'GET', '/search?q=question+topic'),
+        'ask_question_get': lambda: _timed(student, 'GET', '/ask_question'),
+        'ask_question_post': lambda: _timed(student, 'POST', '/ask_question', data={
+            'title': f'Benchmark question {random.random()}', 'description': 'timing run',
+            'subject_id': fx['subject_id'], 'confirm': '1'}),
+        'leaderboard': lambda: _timed(student, 'GET', '/leaderboard'),
+        'announcements': lambda: _timed(student, 'GET', '/announcements'),
+        'faculty_dashboard': lambda: _timed(faculty, 'GET', '/faculty/dashboard'),
+        'faculty_questions': lambda: _timed(faculty, 'GET', '/faculty/questions'),
+        'faculty_questions_hot': lambda: _timed(faculty, 'GET', '/faculty/questions?sort=hot'),
+        'post_announcement_get': lambda: _timed(faculty, 'GET', '/faculty/announcement'),
+        'answer_question': lambda: _timed(faculty, 'POST', f'/answer/{next(question_pool)}',
+                                          data={'content': 'Benchmark answer'}),
+        'upvote': lambda: upvote(student),
+        'register': register,
+        'logout': logout,
+        'delete_question': lambda: _timed(student, 'POST', f"/delete_question/{next(fx['own_questions'])}"),
+        'faculty_questions_post': lambda: _timed(faculty, 'POST', '/faculty/questions', data={
+            'question_id': next(question_pool), 'answer_text': 'Benchmark answer'}),
+        'faculty_dashboard_post': lambda: _timed(faculty, 'POST', '/faculty/dashboard', data=announcement),
+        'post_announcement_post': lambda: _timed(faculty, 'POST', '/faculty/announcement', data=announcement),
+        'edit_announcement': lambda: _timed(
+            faculty, 'POST', f"/faculty/announcement/{next(fx['edited_announcements'])}/edit",
+            json={'title': 'Edited', 'content': 'timing run'}),
+        'delete_announcement': lambda: _timed(
+            faculty, 'POST', f"/faculty/announcement/{next(fx['deleted_announcements'])}/delete"),
+        'archive': lambda: _timed(student, 'GET', '/archive?q=question'),
+        'export_questions': lambda: _timed(faculty, 'GET', '/api/v1/export/questions'),
+        'export_leaderboard': lambda: _timed(admin, 'GET', '/api/v1/export/leaderboard'),
+        'moderate_questions': lambda: _timed(admin, 'POST', '/admin/moderation/questions', json={
+            'question_ids': [next(fx['moderated_questions'])]}),
+        'moderate_announcements': lambda: _timed(admin, 'POST', '/admin/moderation/announcements', json={
+            'announcement_ids': [next(fx['moderated_announcements'])]}),
+        'debug_perf': lambda: _timed(admin, 'GET', '/debug/perf'),
+        'debug_hashing': lambda: _timed(admin, 'GET', '/debug/hashing'),
+    }
+
+    results = {}
+    for name, case in cases.items():
+        timings, queries = [], []
+        for _ in range(repeat):
+            response, elapsed, query_count = case()
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+            timings.append(elapsed)
+            queries.append(query_count)
+        results[name] = {**_percentiles(timings), 'queries': max(queries)}
+    return results
+
+
+def bench_scenario(app, users, iterations):
+    """Concurrent users running login -> feed -> page 2 -> upvote -> answer."""
+    fx = _fixtures(app)
+    timings, queries, errors = [], [], []
+    lock = threading.Lock()
+
+    def record(response, elapsed, query_count):
+        with lock:
+            timings.append(elapsed)
+            queries.append(query_count)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+
+    def student_flow(username, seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        _login(client, username)
+        for _ in range(iterations):
+            response, elapsed, qc = _timed(client, 'GET', '/all_questions')
+            record(response, elapsed, qc)
+            cursor = re.search(r'cursor=([A-Za-z0-9_\-]+)', response.get_data(as_text=True))
+            if cursor:
+                record(*_timed(client, 'GET', f'/all_questions?cursor={cursor.group(1)}'))
+            record(*_timed(client, 'POST', f'/upvote/{rng.choice(fx["answers"])}',
+                           headers={'X-Requested-With': 'XMLHttpRequest'}))
+
+    def faculty_flow(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        _login(client, fx['faculty'])
+        for _ in range(iterations):
+            record(*_timed(client, 'GET', '/faculty/questions'))
+            record(*_timed(client, 'POST', f'/answer/{rng.choice(fx["questions"])}',
+                           data={'content': 'Scenario answer'}))
+
+    threads = [threading.Thread(target=student_flow, args=(fx['students'][i % len(fx['students'])], i))
+               for i in range(users)]
+    threads.append(threading.Thread(target=faculty_flow, args=(users,)))
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    return {**_percentiles(timings), 'requests': len(timings), 'errors': len(errors),
+            'throughput_rps': round(len(timings) / wall, 1),
+            'queries_per_request': round(statistics.mean(queries), 2)}
+
+
+def bench_startup(runs):
+    """Cold start of a worker: a new interpreter importing wsgi.app, `runs` times."""
+    app_ms, process_ms = [], []
+    here = os.path.dirname(os.path.abspath(__file__))
+    # create_app() insists on these; nothing connects during startup, so any value will do
+    env = {'SECRET_KEY': 'benchmark', 'DATABASE_URL': 'sqlite://', **os.environ}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', _STARTUP_SNIPPET], cwd=here, check=True,
+                                capture_output=True, text=True, env=env).stdout
+        process_ms.append((time.perf_counter() - start) * 1000)
+        app_ms.append(float(output.strip().splitlines()[-1]) * 1000)
+    return {**_percentiles(app_ms), 'process_p50_ms': _percentiles(process_ms)['p50_ms']}
+
+
+def compare(results, baseline, tolerance):
+    """List human-readable regressions of `results` against `baseline`."""
+    regressions = []
+
+    def check(path, current, previous):
+        if previous['p50_ms'] and current['p50_ms'] > previous['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{path}: p50 {previous['p50_ms']}ms -> {current['p50_ms']}ms")
+        for key in ('queries', 'queries_per_request'):
+            if key in previous and current.get(key, 0) > previous[key]:
+                regressions.append(f"{path}: {key} {previous[key]} -> {current[key]}")
+
+    for size, routes in results.get('routes', {}).items():
+        for route, current in routes.items():
+            previous = baseline.get('routes', {}).get(size, {}).get(route)
+            if previous:
+                check(f'routes[{size}].{route}', current, previous)
+    for part in ('scenario', 'startup'):
+        if part in results and part in baseline:
+            check(part, results[part], baseline[part])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=20, help='requests per route')
+    parser.add_argument('--users', type=int, default=10, help='concurrent scenario users')
+    parser.add_argument('--iterations', type=int, default=10, help='scenario loops per user')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--force', action='store_true', help='allow a non-SQLite DATABASE_URL')
+    parser.add_argument('--startup-runs', type=int, default=5, help='cold starts to time')
+    parser.add_argument('--startup-target-ms', type=float, default=1000,
+                        help='fail if the p50 import + create_app time is above this')
+    parser.add_argument('--startup-only', action='store_true', help='only time cold starts (no database needed)')
+    args = parser.parse_args(argv)
+
+    print(f'Startup: {args.startup_runs} cold starts')
+    startup = bench_startup(args.startup_runs)
+    print(f"  create_app p50 {startup['p50_ms']:.1f}ms  p95 {startup['p95_ms']:.1f}ms  "
+          f"(whole process {startup['process_p50_ms']:.1f}ms, target {args.startup_target_ms:.0f}ms)")
+    if startup['p50_ms'] > args.startup_target_ms:
+        print(f"REGRESSION startup: p50 {startup['p50_ms']}ms over the {args.startup_target_ms:.0f}ms target")
+        return 1
+    if args.startup_only:
+        return 0
+
+    url = os.environ.get('DATABASE_URL', '')
+    if not url:
+        sys.exit('Set DATABASE_URL to a throwaway database; it will be wiped.')
+    if not url.startswith('sqlite') and not args.force:
+        sys.exit(f'Refusing to wipe {url} without --force.')
+
+    from app import create_app
+    # Scenario users all log in at once; let them queue for the hash pool
+    app = create_app({'SECRET_KEY': 'benchmark', 'PASSWORD_HASH_QUEUE': args.users * 2})
+
+    results = {'routes': {}, 'startup': startup}
+    for size in args.sizes:
+        print(f'Seeding {size} questions...')
+        _reset_and_seed(app, size)
+        results['routes'][str(size)] = bench_routes(app, args.repeat)
+        for route, stats in results['routes'][str(size)].items():
+            print(f"  {route:24} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  {stats['queries']} queries")
+
+    print(f'Scenario: {args.users} users x {args.iterations} iterations at {args.sizes[-1]} questions')
+    results['scenario'] = bench_scenario(app, args.users, args.iterations)
+    print('  ' + json.dumps(results['scenario']))
+
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline first.')
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for line in regressions:
+        print('REGRESSION ' + line)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
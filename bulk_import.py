@@ -0,0 +1,205 @@
+import csv
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
+
+from sqlalchemy import Boolean, DateTime, Integer, func, insert
+from werkzeug.security import generate_password_hash
+
+from models import db, Department, Subject, User, FacultySubject, Question, Answer, Upvote
+import passwords
+
+# ---------------------------
+# Bulk import and seed data
+# ---------------------------
+# Rows are streamed from CSV/JSONL (column names = model column names) and
+# written with executemany INSERTs, committing every `chunk_size` rows.
+# User rows may carry a plain `password`; those are hashed with the configured
+# PASSWORD_HASH_METHOD in a process pool, so a big import uses every core
+# instead of one.
+
+TABLES = {
+    'department': Department,
+    'subject': Subject,
+    'user': User,
+    'faculty_subject': FacultySubject,
+    'question': Question,
+    'answer': Answer,
+    'upvote': Upvote,
+}
+
+CHUNK_SIZE = 2000
+
+
+def read_records(path):
+    """Yield dicts from a .csv or .jsonl file without loading it all."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _coerce(table, row):
+    # CSV gives strings; convert to what the column type expects
+    values = {}
+    for column in table.columns:
+        if column.name not in row:
+            continue
+        value = row[column.name]
+        if value == '' or value is None:
+            value = None
+        elif isinstance(value, str):
+            if isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, Boolean):
+                value = value.strip().lower() in ('1', 'true', 'yes')
+            elif isinstance(column.type, Integer):
+                value = int(value)
+        values[column.name] = value
+    return values
+
+
+def _hash_password(method, password):
+    return generate_password_hash(password, method)
+
+
+def import_file(table_name, path, chunk_size=CHUNK_SIZE, workers=None):
+    """Stream one file into one table. Returns the number of rows inserted."""
+    model = TABLES[table_name]
+    table = model.__table__
+    total = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if table_name == 'user' else None
+    try:
+        for chunk in _chunks(read_records(path), chunk_size):
+            if pool is not None:
+                plain = [row.pop('password', None) for row in chunk]
+                to_hash = [p for p in plain if p]
+                hashed = iter(pool.map(partial(_hash_password, passwords.configured_method()),
+                                       to_hash, chunksize=32))
+                for row, password in zip(chunk, plain):
+                    if password:
+                        row['password_hash'] = next(hashed)
+            db.session.execute(insert(table), [_coerce(table, row) for row in chunk])
+            db.session.commit()
+            total += len(chunk)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return total
+
+
+# ---------- Synthetic semester for load tests ----------
+def _next_id(column):
+    return (db.session.query(func.max(column)).scalar() or 0) + 1
+
+
+def _insert_stream(table, rows, chunk_size):
+    total = 0
+    for chunk in _chunks(rows, chunk_size):
+        db.session.execute(insert(table), chunk)
+        db.session.commit()
+        total += len(chunk)
+    return total
+
+
+def seed(departments=5, subjects_per_department=8, students=20000, faculty=200, questions=500000,
+         answer_ratio=0.6, upvotes_per_answer=3, password='password', chunk_size=CHUNK_SIZE, rng_seed=42):
+    """Generate a full synthetic semester. Returns row counts per table.
+
+    Every seeded account shares one password, hashed once, so seeding
+    20k users doesn't spend minutes in the hash function.
+    """
+    rng = random.Random(rng_seed)
+    counts = {}
+    password_hash = passwords.hash_password(password)
+    start = datetime.utcnow() - timedelta(days=120)
+
+    dept_start = _next_id(Department.department_ID)
+    dept_ids = list(range(dept_start, dept_start + departments))
+    counts['department'] = _insert_stream(Department.__table__, (
+        {'department_ID': d, 'name': f'Department {d}'} for d in dept_ids), chunk_size)
+
+    subject_start = _next_id(Subject.subject_ID)
+    subject_dept = {subject_start + i: dept_ids[i // subjects_per_department]
+                    for i in range(departments * subjects_per_department)}
+    counts['subject'] = _insert_stream(Subject.__table__, (
+        {'subject_ID': s, 'name': f'Subject {s}', 'department_ID': d} for s, d in subject_dept.items()), chunk_size)
+    subject_ids = list(subject_dept)
+
+    user_start = _next_id(User.user_ID)
+    faculty_ids = list(range(user_start, user_start + faculty))
+    student_ids = list(range(user_start + faculty, user_start + faculty + students))
+    roles = [(u, 'faculty') for u in faculty_ids] + [(u, 'student') for u in student_ids]
+    counts['user'] = _insert_stream(User.__table__, (
+        {'user_ID': u, 'username': f'{role}{u}', 'password_hash': password_hash, 'role': role,
+         'department_ID': rng.choice(dept_ids), 'reputation_points': 0}
+        for u, role in roles), chunk_size)
+
+    teachers = {s: [] for s in subject_ids}
+    fs_rows = []
+    for i, faculty_id in enumerate(faculty_ids):
+        subject_id = subject_ids[i % len(subject_ids)]
+        teachers[subject_id].append(faculty_id)
+        fs_rows.append({'faculty_ID': faculty_id, 'subject_ID': subject_id})
+    counts['faculty_subject'] = _insert_stream(FacultySubject.__table__, fs_rows, chunk_size)
+
+    question_start = _next_id(Question.question_ID)
+    answer_start = _next_id(Answer.answer_ID)
+    answered = []  # (answer_ID, question_ID, faculty_ID, created_at)
+
+    def question_rows():
+        for i in range(questions):
+            question_id = question_start + i
+            subject_id = rng.choice(subject_ids)
+            created_at = start + timedelta(seconds=i * 120 * 86400 // max(questions, 1))
+            is_answered = bool(teachers[subject_id]) and rng.random() < answer_ratio
+            if is_answered:
+                answered.append((answer_start + len(answered), question_id,
+                                 rng.choice(teachers[subject_id]), created_at + timedelta(hours=rng.randint(1, 48))))
+            yield {'question_ID': question_id, 'subject_ID': subject_id, 'student_ID': rng.choice(student_ids),
+                   'title': f'Question {question_id} about topic {rng.randint(1, 500)}',
+                   'description': f'Details for question {question_id}: concept {rng.randint(1, 5000)}',
+                   'created_at': created_at, 'is_answered': is_answered}
+    counts['question'] = _insert_stream(Question.__table__, question_rows(), chunk_size)
+
+    votes_per_answer = {}
+    for answer_id, _, _, _ in answered:
+        votes_per_answer[answer_id] = rng.randint(0, upvotes_per_answer * 2)
+    counts['answer'] = _insert_stream(Answer.__table__, (
+        {'answer_ID': answer_id, 'question_ID': question_id, 'faculty_ID': faculty_id,
+         'content': f'Answer to question {question_id}', 'created_at': created_at,
+         'upvote_count': votes_per_answer[answer_id]}
+        for answer_id, question_id, faculty_id, created_at in answered), chunk_size)
+
+    def upvote_rows():
+        for answer_id, votes in votes_per_answer.items():
+            for student_id in rng.sample(student_ids, min(votes, len(student_ids))):
+                yield {'answer_ID': answer_id, 'user_ID': student_id}
+    counts['upvote'] = _insert_stream(Upvote.__table__, upvote_rows(), chunk_size)
+
+    # Reputation follows the upvotes we just generated (10 points each)
+    points = {}
+    for answer_id, _, faculty_id, _ in answered:
+        points[faculty_id] = points.get(faculty_id, 0) + 10 * votes_per_answer[answer_id]
+    for chunk in _chunks(points.items(), chunk_size):
+        db.session.execute(
+            User.__table__.update().where(User.__table__.c.user_ID == db.bindparam('uid'))
+            .values(reputation_points=db.bindparam('points')),
+            [{'uid': uid, 'points': p} for uid, p in chunk])
+        db.session.commit()
+    return counts
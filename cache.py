@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from models import db, User, Department, Subject, FacultySubject
+
+# ---------------------------
+# Process-local caches for users and lookup tables
+# ---------------------------
+# Cached rows are stored as detached copies (never the instance a request is
+# using), and are merged back into the request's session with load=False, so
+# a cache hit costs no query. current_user.department is filled from the
+# department cache the same way.
+
+USER_CACHE_SIZE = 2048
+USER_TTL = 300       # seconds
+LOOKUP_TTL = 600     # departments, subjects, faculty-subject mapping
+
+
+class LRUCache:
+    """Thread-safe LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() > expires_at:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+users = LRUCache(USER_CACHE_SIZE, USER_TTL)
+lookups = LRUCache(256, LOOKUP_TTL)
+
+
+def _detached_copy(obj):
+    # Column values only, with an identity key, outside any session
+    copy = type(obj)()
+    for attr in inspect(type(obj)).column_attrs:
+        setattr(copy, attr.key, getattr(obj, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _attach(obj):
+    return db.session.merge(obj, load=False)
+
+
+# ---------- Users ----------
+def get_user(user_id):
+    """The user for Flask-Login, from cache when possible."""
+    cached = users.get(user_id)
+    if cached is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+        users.set(user_id, _detached_copy(user))
+        return user
+
+    user = _attach(cached)
+    department = _departments_by_id().get(cached.department_ID)
+    if department is not None:
+        # Pre-fill user.department so templates don't lazy-load it
+        set_committed_value(user, 'department', _attach(department))
+    return user
+
+
+def invalidate_user(user_id):
+    users.delete(user_id)
+
+
+# ---------- Lookup tables ----------
+def _cached_list(key, loader):
+    rows = lookups.get(key)
+    if rows is None:
+        rows = [_detached_copy(row) for row in loader()]
+        lookups.set(key, rows)
+    return rows
+
+
+def departments():
+    """All departments ordered by name (detached, read-only)."""
+    return _cached_list('departments', lambda: Department.query.order_by(Department.name).all())
+
+
+def _departments_by_id():
+    return {d.department_ID: d for d in departments()}
+
+
+def department(department_id):
+    return _departments_by_id().get(department_id)
+
+
+def subjects(department_id=None):
+    """All subjects ordered by name, optionally for one department."""
+    rows = _cached_list('subjects', lambda: Subject.query.order_by(Subject.name).all())
+    if department_id is None:
+        return rows
+    return [s for s in rows if s.department_ID == department_id]
+
+
+def faculty_subject_ids(faculty_id):
+    """Subject IDs a faculty member teaches."""
+    key = ('faculty_subjects', faculty_id)
+    ids = lookups.get(key)
+    if ids is None:
+        ids = [row[0] for row in db.session.query(FacultySubject.subject_ID).filter_by(faculty_ID=faculty_id)]
+        lookups.set(key, ids)
+    return ids
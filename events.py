@@ -0,0 +1,171 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import db, EventLog
+
+# ---------------------------
+# Pub/sub for server-sent events
+# ---------------------------
+# Write routes publish small events tagged with the scopes they concern
+# (a department, a subject, a user). Each /events connection subscribes with
+# the scopes of the logged-in user and only receives matching events.
+#
+# A write can land on any worker, so publish() appends the event to the
+# event_log table instead of a process-local queue. Every process that has
+# /events clients runs one relay thread that reads new rows every
+# POLL_SECONDS and hands them to its own subscribers; rows older than
+# KEEP_SECONDS are trimmed as new ones arrive. Open streams are best served
+# by a separate async worker (gunicorn -k gevent, see README) so they don't
+# pin the page workers' threads.
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+POLL_SECONDS = 1.0
+RELAY_BATCH = 500
+KEEP_SECONDS = 600
+TRIM_EVERY = 200  # events between trims
+
+log = logging.getLogger(__name__)
+
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # queue -> set of scopes
+
+    def subscribe(self, scopes):
+        q = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[q] = set(scopes)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.pop(q, None)
+
+    def publish(self, event_type, data, department_id=None, subject_id=None, user_id=None):
+        scopes = {('department', department_id), ('subject', subject_id), ('user', user_id)}
+        scopes = {scope for scope in scopes if scope[1] is not None}
+        message = (event_type, data)
+        with self._lock:
+            targets = [q for q, wanted in self._subscribers.items() if wanted & scopes]
+        for q in targets:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                pass  # slow client; it will catch up on its next page load
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+bus = EventBus()
+
+_relay_lock = threading.Lock()
+_relay = {'thread': None}
+
+
+def publish(event_type, data, department_id=None, subject_id=None, user_id=None):
+    """Record an event for every worker's subscribers. Call after the write commits."""
+    try:
+        with db.engine.begin() as conn:
+            event_id = conn.execute(insert(EventLog).values(
+                event_type=event_type, payload=json.dumps(data), department_ID=department_id,
+                subject_ID=subject_id, user_ID=user_id, created_at=datetime.utcnow(),
+            )).inserted_primary_key[0]
+            if event_id % TRIM_EVERY == 0:
+                cutoff = datetime.utcnow() - timedelta(seconds=KEEP_SECONDS)
+                conn.execute(delete(EventLog).where(EventLog.created_at < cutoff))
+    except SQLAlchemyError:
+        # The write itself has committed; a lost event only costs a live refresh
+        log.exception('could not publish %s event', event_type)
+
+
+# ---------- Relay (event_log -> this process's subscribers) ----------
+def _relay_once(last_id):
+    with db.engine.connect() as conn:
+        if last_id is None:
+            # Start from now; older events were for earlier connections
+            return conn.execute(select(func.coalesce(func.max(EventLog.event_ID), 0))).scalar()
+        rows = conn.execute(
+            select(EventLog.event_ID, EventLog.event_type, EventLog.payload, EventLog.department_ID,
+                   EventLog.subject_ID, EventLog.user_ID)
+            .where(EventLog.event_ID > last_id).order_by(EventLog.event_ID).limit(RELAY_BATCH)).all()
+    for row in rows:
+        bus.publish(row.event_type, json.loads(row.payload), department_id=row.department_ID,
+                    subject_id=row.subject_ID, user_id=row.user_ID)
+    return rows[-1].event_ID if rows else last_id
+
+
+def _relay_loop(app):
+    last_id = None
+    while True:
+        if not bus.subscriber_count():
+            last_id = None  # nobody listening; don't replay the gap later
+        else:
+            with app.app_context():
+                try:
+                    last_id = _relay_once(last_id)
+                except Exception:
+                    log.exception('event relay error')
+        time.sleep(POLL_SECONDS)
+
+
+def start_relay(app):
+    """Start this process's relay thread (once)."""
+    with _relay_lock:
+        if _relay['thread'] is None:
+            thread = threading.Thread(target=_relay_loop, args=(app,), name='event-relay', daemon=True)
+            thread.start()
+            _relay['thread'] = thread
+
+
+# ---------- Events published by the write routes ----------
+def question_asked(question):
+    publish('question', {'question_ID': question.question_ID, 'title': question.title},
+            subject_id=question.subject_ID)
+
+
+def answer_posted(question, answer):
+    # Reaches the subject's followers and the student who asked (once, even if both)
+    publish('answer', {'question_ID': question.question_ID, 'answer_ID': answer.answer_ID,
+                       'title': question.title, 'student_ID': question.student_ID},
+            subject_id=question.subject_ID, user_id=question.student_ID)
+
+
+def answer_upvoted(answer, subject_id, count):
+    publish('upvote', {'answer_ID': answer.answer_ID, 'count': count}, subject_id=subject_id)
+
+
+def announcement_posted(announcement):
+    publish('announcement', {'announcement_ID': announcement.announcement_ID,
+                             'title': announcement.title},
+            department_id=announcement.department_ID)
+
+
+def stream(scopes):
+    """Generator of SSE frames for one client until it disconnects."""
+    q = bus.subscribe(scopes)
+    start_relay(current_app._get_current_object())
+    try:
+        yield 'retry: 5000\n\n'
+        last_beat = time.monotonic()
+        while True:
+            try:
+                event_type, data = q.get(timeout=HEARTBEAT_SECONDS)
+                yield f'event: {event_type}\ndata: {json.dumps(data)}\n\n'
+            except queue.Empty:
+                pass
+            if time.monotonic() - last_beat >= HEARTBEAT_SECONDS:
+                yield ': keep-alive\n\n'
+                last_beat = time.monotonic()
+    finally:
+        bus.unsubscribe(q)
@@ -0,0 +1,137 @@
+import json
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from models import db, Question, Answer, Upvote, Subject
+import leaderboard_cache
+
+# ---------------------------
+# NDJSON export
+# ---------------------------
+# /api/v1/export/<resource> streams one JSON object per line. Rows are read
+# in keyset batches (WHERE id > last ORDER BY id LIMIT n) as plain Core rows,
+# so memory stays flat however large the export, and the connection is never
+# held by a half-read cursor. Every row carries its ID; to resume a broken
+# download pass ?after=<last ID received>.
+#
+# Filters: department, subject, since, until (YYYY-MM-DD, on created_at;
+# upvotes have no timestamp so they use their answer's).
+
+BATCH_SIZE = 1000
+
+
+class ExportError(ValueError):
+    pass
+
+
+def parse_filters(args):
+    """Filters and resume cursor from the query string; raises ExportError on bad input."""
+    def as_int(name):
+        value = args.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ExportError(f'{name} must be an integer')
+
+    def as_date(name):
+        value = args.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise ExportError(f'{name} must be a date (YYYY-MM-DD)')
+
+    filters = {
+        'department': as_int('department'),
+        'subject': as_int('subject'),
+        'since': as_date('since'),
+        'until': as_date('until'),
+    }
+    return filters, as_int('after') or 0
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _scope(statement, filters, created_at):
+    if filters['subject'] is not None:
+        statement = statement.where(Question.subject_ID == filters['subject'])
+    if filters['department'] is not None:
+        statement = statement.where(Subject.department_ID == filters['department'])
+    if filters['since'] is not None:
+        statement = statement.where(created_at >= datetime.combine(filters['since'], datetime.min.time()))
+    if filters['until'] is not None:
+        # until is inclusive: everything before the next midnight
+        statement = statement.where(created_at < datetime.combine(filters['until'] + timedelta(days=1),
+                                                                  datetime.min.time()))
+    return statement
+
+
+def _questions(filters):
+    statement = (select(Question.question_ID, Question.subject_ID, Subject.department_ID,
+                        Question.student_ID, Question.title, Question.description,
+                        Question.created_at, Question.is_answered)
+                 .join(Subject, Question.subject_ID == Subject.subject_ID))
+    return _scope(statement, filters, Question.created_at), Question.question_ID
+
+
+def _answers(filters):
+    statement = (select(Answer.answer_ID, Answer.question_ID, Question.subject_ID, Subject.department_ID,
+                        Answer.faculty_ID, Answer.content, Answer.created_at, Answer.upvote_count)
+                 .join(Question, Answer.question_ID == Question.question_ID)
+                 .join(Subject, Question.subject_ID == Subject.subject_ID))
+    return _scope(statement, filters, Answer.created_at), Answer.answer_ID
+
+
+def _upvotes(filters):
+    statement = (select(Upvote.upvote_ID, Upvote.answer_ID, Upvote.user_ID, Answer.question_ID,
+                        Question.subject_ID, Subject.department_ID)
+                 .join(Answer, Upvote.answer_ID == Answer.answer_ID)
+                 .join(Question, Answer.question_ID == Question.question_ID)
+                 .join(Subject, Question.subject_ID == Subject.subject_ID))
+    return _scope(statement, filters, Answer.created_at), Upvote.upvote_ID
+
+
+RESOURCES = {
+    'questions': _questions,
+    'answers': _answers,
+    'upvotes': _upvotes,
+}
+EXPORTS = (*RESOURCES, 'leaderboard')
+
+
+def _rows(resource, filters, after, batch_size):
+    statement, key = RESOURCES[resource](filters)
+    last_id = after
+    while True:
+        batch = db.session.execute(statement.where(key > last_id).order_by(key).limit(batch_size)).all()
+        if not batch:
+            return
+        for row in batch:
+            yield {name: _iso(value) for name, value in row._mapping.items()}
+        last_id = batch[-1][0]
+
+
+def _leaderboard_rows(filters, after):
+    # Already ranked in memory (leaderboard_cache); `after` is a rank here
+    for entry in leaderboard_cache.ranked():
+        if entry.rank <= after:
+            continue
+        if filters['department'] is not None and entry.department_ID != filters['department']:
+            continue
+        yield entry._asdict()
+
+
+def stream(resource, filters, after=0, batch_size=BATCH_SIZE):
+    """Generator of NDJSON lines for one resource."""
+    if resource == 'leaderboard':
+        rows = _leaderboard_rows(filters, after)
+    else:
+        rows = _rows(resource, filters, after, batch_size)
+    for row in rows:
+        yield json.dumps(row) + '\n'
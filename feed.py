@@ -0,0 +1,133 @@
+import base64
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+
+import cache
+import hot
+from models import Question, Answer
+
+# ---------------------------
+# Question feed (keyset pagination)
+# ---------------------------
+# Pages are keyed on (created_at, question_ID) instead of OFFSET, so fetching
+# page 500 costs the same as page 1. Each page is always two queries:
+# questions + authors, then answers + answer authors for that page.
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+SORTS = ('new', 'hot')
+
+
+class RankedPage:
+    """The parts of a Flask-SQLAlchemy Pagination the templates use, for a page of hot.py's ranking."""
+
+    def __init__(self, items, page, per_page, total):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.pages = max(1, -(-total // per_page))
+        self.has_prev = page > 1
+        self.has_next = page < self.pages
+        self.prev_num = page - 1 if self.has_prev else None
+        self.next_num = page + 1 if self.has_next else None
+
+
+def encode_cursor(question):
+    raw = f"{question.created_at.isoformat()}|{question.question_ID}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    # Returns (created_at, question_ID) or None for a missing/garbled cursor
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, question_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(question_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def eager_question_options():
+    # Authors, answers and answer authors for a page of question cards
+    return (
+        joinedload(Question.user),
+        selectinload(Question.answers).joinedload(Answer.user),
+    )
+
+
+def load_feed(cursor=None, limit=PAGE_SIZE, base_query=None):
+    """Return (questions, next_cursor) for one page of the newest-first feed.
+
+    next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = base_query if base_query is not None else Question.query
+    query = query.options(*eager_question_options())
+
+    position = decode_cursor(cursor)
+    if position:
+        created_at, question_id = position
+        query = query.filter(or_(
+            Question.created_at < created_at,
+            and_(Question.created_at == created_at, Question.question_ID < question_id),
+        ))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(Question.created_at.desc(), Question.question_ID.desc()).limit(limit + 1).all()
+    questions = rows[:limit]
+    next_cursor = encode_cursor(questions[-1]) if len(rows) > limit else None
+    return questions, next_cursor
+
+
+def load_hot(subject_ids=None, page=1, per_page=PAGE_SIZE, options=None):
+    """One page of the hot ranking (hot.py) over some subjects, or all, as a RankedPage.
+
+    The order comes from memory; the page's questions are then fetched by ID.
+    """
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+    page = max(page, 1)
+    question_ids, total = hot.page(subject_ids, page, per_page)
+    questions = []
+    if question_ids:
+        rows = (Question.query.filter(Question.question_ID.in_(question_ids))
+                .options(*(options or eager_question_options())).all())
+        by_id = {q.question_ID: q for q in rows}
+        # Deleted since the ranking was loaded: skip
+        questions = [by_id[question_id] for question_id in question_ids if question_id in by_id]
+    return RankedPage(questions, page, per_page, total)
+
+
+# ---------------------------
+# Faculty question queue
+# ---------------------------
+def load_faculty_queue(faculty_id, page=1, per_page=PAGE_SIZE, sort='new'):
+    """Return (subjects, pagination) for the subjects a faculty member teaches.
+
+    Unanswered questions come first, newest first within each group; with
+    sort='hot' they come in hot.py's order instead. Subjects come from the
+    lookup cache; students, answers and answer authors are loaded up front, so
+    the page costs the same handful of queries however many questions it shows.
+    """
+    subject_ids = cache.faculty_subject_ids(faculty_id)
+    subjects = [s for s in cache.subjects() if s.subject_ID in subject_ids]
+    options = (
+        joinedload(Question.user),
+        joinedload(Question.subject),
+        selectinload(Question.answers).joinedload(Answer.user),
+    )
+    if sort == 'hot':
+        return subjects, load_hot(subject_ids, page, per_page, options=options)
+
+    questions = (
+        Question.query
+        .filter(Question.subject_ID.in_(subject_ids))
+        .options(*options)
+        .order_by(Question.is_answered.asc(), Question.created_at.desc(), Question.question_ID.desc())
+        .paginate(page=page, per_page=min(per_page, MAX_PAGE_SIZE), error_out=False)
+    )
+    return subjects, questions
@@ -0,0 +1,86 @@
+from flask import render_template
+from flask_login import current_user
+from markupsafe import Markup
+
+from cache import LRUCache
+
+# ---------------------------
+# Rendered-fragment cache
+# ---------------------------
+# Question cards and announcement cards are rendered once and reused until
+# their version stamp changes. The stamp is built from data the page already
+# loaded (answer IDs + upvote counts, announcement text), so a stale card can
+# never be served, even by another worker. The write routes also call
+# invalidate() to free the old entry straight away.
+
+MAX_FRAGMENTS = 5000
+FRAGMENT_TTL = 3600  # seconds
+
+_fragments = LRUCache(MAX_FRAGMENTS, FRAGMENT_TTL)
+_VARIANTS = (None, True, False)
+
+
+def _render_cached(kind, entity_id, variant, stamp, template, **context):
+    key = (kind, entity_id, variant)
+    entry = _fragments.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+    html = Markup(render_template(template, **context))
+    _fragments.set(key, (stamp, html))
+    return html
+
+
+def invalidate(kind, entity_id):
+    for variant in _VARIANTS:
+        _fragments.delete((kind, entity_id, variant))
+
+
+def invalidate_question(question_id):
+    invalidate('question', question_id)
+    invalidate('my_question', question_id)
+
+
+def invalidate_announcement(announcement_id):
+    invalidate('announcement', announcement_id)
+    invalidate('dashboard_announcement', announcement_id)
+
+
+# ---------- Stamps ----------
+def _question_stamp(q):
+    return (q.is_answered, tuple((a.answer_ID, a.upvote_count) for a in q.answers))
+
+
+def _announcement_stamp(a):
+    return hash((a.title, a.content))
+
+
+# ---------- Template helpers ----------
+def question_card(q):
+    # Students get a live upvote button, everyone else a disabled one
+    is_student = current_user.is_authenticated and current_user.role == 'student'
+    return _render_cached('question', q.question_ID, is_student, _question_stamp(q),
+                          'question_card.html', q=q)
+
+
+def my_question_card(q):
+    return _render_cached('my_question', q.question_ID, None, _question_stamp(q),
+                          'my_question_card.html', q=q)
+
+
+def announcement_card(a):
+    return _render_cached('announcement', a.announcement_ID, None, _announcement_stamp(a),
+                          'announcement_card.html', a=a)
+
+
+def dashboard_announcement(a):
+    return _render_cached('dashboard_announcement', a.announcement_ID, None, _announcement_stamp(a),
+                          'dashboard_announcement.html', a=a)
+
+
+def init_app(app):
+    app.jinja_env.globals.update(
+        question_card=question_card,
+        my_question_card=my_question_card,
+        announcement_card=announcement_card,
+        dashboard_announcement=dashboard_announcement,
+    )
@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+
+# ---------------------------
+# gunicorn settings (gunicorn -c gunicorn.conf.py wsgi:app)
+# ---------------------------
+# The app is imported once in the master (preload_app) and forked, so
+# workers start in milliseconds and share its memory copy-on-write. Nothing
+# connects to the database at import; each worker opens its own pool, job
+# threads and hashing processes on first use.
+#
+# Page traffic runs on gthread workers. /events streams are long-lived, so
+# they get their own instance with one gevent worker (GUNICORN_WORKER_CLASS=
+# gevent, see README) and the proxy sends /events there; events reach it
+# through the event_log table whichever worker handled the write.
+#
+#   BIND, WEB_CONCURRENCY (workers), GUNICORN_THREADS, GUNICORN_TIMEOUT,
+#   GUNICORN_WORKER_CLASS, GUNICORN_WORKER_CONNECTIONS (gevent only)
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+# Threads cover I/O waits (DB); CPU-heavy hashing runs in passwords.py's pool
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 2000))
+# gevent has to patch the standard library before the app is imported
+preload_app = worker_class == 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then so slow leaks can't build up
+max_requests = 5000
+max_requests_jitter = 500
+
+
+def post_fork(server, worker):
+    # Don't share connections the master may have opened with the children
+    if not preload_app:
+        return
+    from wsgi import app
+    from models import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
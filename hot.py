@@ -0,0 +1,164 @@
+import heapq
+import math
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import func
+
+from models import db, Question, Answer
+
+# ---------------------------
+# "Hot" question ranking (process-local)
+# ---------------------------
+# A question's score is its activity decayed by age:
+#
+#   activity = 1 + ANSWER_WEIGHT * answers + UPVOTE_WEIGHT * upvotes on its answers
+#              (times ANSWERED_FACTOR once it is answered)
+#   score    = activity * 0.5 ** (age_hours / HALF_LIFE_HOURS)
+#
+# Every question decays at the same rate, so the order never changes just
+# because time passes. Each question is therefore kept under the fixed key
+# log2(activity) + created_hours / HALF_LIFE_HOURS, in one sorted list per
+# subject. Write routes and the upvote job move single entries
+# (question_asked, question_answered, upvoted, questions_deleted); bulk
+# deletes and subject purges call invalidate(). A page is a merge of the wanted subjects' lists. Questions
+# older than WINDOW_DAYS are left out.
+# Like the leaderboard, each process reloads the whole ranking from the
+# database every RELOAD_SECONDS, which picks up other workers' writes.
+
+HALF_LIFE_HOURS = 24.0
+ANSWER_WEIGHT = 2.0
+UPVOTE_WEIGHT = 1.0
+ANSWERED_FACTOR = 0.25  # answered questions sink below open ones with similar activity
+WINDOW_DAYS = 30
+RELOAD_SECONDS = 300
+
+_EPOCH = datetime(2020, 1, 1)
+
+HotEntry = namedtuple('HotEntry', 'subject_ID created_at answers upvotes is_answered key')
+
+_lock = threading.Lock()
+_state = {'entries': {}, 'by_subject': {}, 'loaded_at': None}
+
+
+def _key(created_at, answers, upvotes, is_answered):
+    activity = 1 + ANSWER_WEIGHT * answers + UPVOTE_WEIGHT * upvotes
+    if is_answered:
+        activity *= ANSWERED_FACTOR
+    return math.log2(activity) + (created_at - _EPOCH).total_seconds() / 3600 / HALF_LIFE_HOURS
+
+
+def _entry(subject_id, created_at, answers, upvotes, is_answered):
+    created_at = created_at or datetime.utcnow()
+    return HotEntry(subject_id, created_at, answers, upvotes, bool(is_answered),
+                    _key(created_at, answers, upvotes, is_answered))
+
+
+# ---------- Loading ----------
+def _load():
+    since = datetime.utcnow() - timedelta(days=WINDOW_DAYS)
+    rows = (
+        db.session.query(Question.question_ID, Question.subject_ID, Question.created_at, Question.is_answered,
+                         func.count(Answer.answer_ID), func.coalesce(func.sum(Answer.upvote_count), 0))
+        .outerjoin(Answer, Answer.question_ID == Question.question_ID)
+        .filter(Question.created_at >= since)
+        .group_by(Question.question_ID, Question.subject_ID, Question.created_at, Question.is_answered)
+        .all()
+    )
+    entries = {question_id: _entry(subject_id, created_at, answers, int(upvotes), is_answered)
+               for question_id, subject_id, created_at, is_answered, answers, upvotes in rows}
+    by_subject = {}
+    for question_id, entry in entries.items():
+        by_subject.setdefault(entry.subject_ID, []).append((-entry.key, question_id))
+    for ranked in by_subject.values():
+        ranked.sort()
+    return entries, by_subject
+
+
+def _ensure_loaded():
+    loaded_at = _state['loaded_at']
+    if loaded_at is not None and time.monotonic() - loaded_at <= RELOAD_SECONDS:
+        return
+    # The first load waits; later reloads happen in one thread while the
+    # others keep serving the previous ranking
+    if not _lock.acquire(blocking=loaded_at is None):
+        return
+    try:
+        if _state['loaded_at'] is None or time.monotonic() - _state['loaded_at'] > RELOAD_SECONDS:
+            entries, by_subject = _load()
+            _state.update(entries=entries, by_subject=by_subject, loaded_at=time.monotonic())
+    finally:
+        _lock.release()
+
+
+def invalidate():
+    with _lock:
+        _state.update(entries={}, by_subject={}, loaded_at=None)
+
+
+# ---------- Incremental updates (call after the write commits) ----------
+def _remove(question_id):
+    entry = _state['entries'].pop(question_id, None)
+    if entry is None:
+        return None
+    ranked = _state['by_subject'].get(entry.subject_ID, [])
+    i = bisect_left(ranked, (-entry.key, question_id))
+    if i < len(ranked) and ranked[i][1] == question_id:
+        del ranked[i]
+    return entry
+
+
+def _place(question_id, entry):
+    _state['entries'][question_id] = entry
+    insort(_state['by_subject'].setdefault(entry.subject_ID, []), (-entry.key, question_id))
+
+
+def _update(question_id, change):
+    # change(entry) -> the fields to replace
+    with _lock:
+        entry = _remove(question_id)
+        if entry is None:
+            return  # not loaded yet, or outside the window
+        values = {**entry._asdict(), **change(entry)}
+        _place(question_id, _entry(values['subject_ID'], values['created_at'], values['answers'],
+                                   values['upvotes'], values['is_answered']))
+
+
+def question_asked(question):
+    with _lock:
+        if _state['loaded_at'] is None:
+            return
+        _remove(question.question_ID)
+        _place(question.question_ID, _entry(question.subject_ID, question.created_at, 0, 0, False))
+
+
+def question_answered(question_id):
+    """A new answer: one more answer, and the question counts as answered."""
+    _update(question_id, lambda e: {'answers': e.answers + 1, 'is_answered': True})
+
+
+def upvoted(question_id, count=1):
+    _update(question_id, lambda e: {'upvotes': e.upvotes + count})
+
+
+def questions_deleted(question_ids):
+    with _lock:
+        for question_id in question_ids:
+            _remove(question_id)
+
+
+# ---------- Reads ----------
+def page(subject_ids=None, page=1, per_page=20):
+    """(question IDs for one page, hottest first; total ranked) over some subjects, or all."""
+    _ensure_loaded()
+    with _lock:
+        by_subject = _state['by_subject']
+        keys = by_subject.keys() if subject_ids is None else [s for s in subject_ids if s in by_subject]
+        lists = [by_subject[s] for s in keys]
+        total = sum(len(ranked) for ranked in lists)
+        start = (max(page, 1) - 1) * per_page
+        return [question_id for _, question_id in islice(heapq.merge(*lists), start, start + per_page)], total
@@ -0,0 +1,193 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import bindparam
+
+from models import db, Job, User, Answer, Question
+import cache
+import events
+import fragments
+import hot
+import leaderboard_cache
+import versions
+
+# ---------------------------
+# Background job queue
+# ---------------------------
+# Requests add side effects to the `job` table in their own transaction
+# (enqueue() before commit), so the job can't outlive or miss the write that
+# caused it. Worker threads claim jobs per kind in batches, coalesce them
+# (ten upvotes on one answer become one "+10" UPDATE) and delete them in the
+# same transaction. A crash just leaves the jobs for the next run; jobs that
+# keep failing stop being retried after MAX_ATTEMPTS and stay in the table.
+
+BATCH_SIZE = 500
+POLL_SECONDS = 1.0
+COALESCE_SECONDS = 0.2  # after a wake-up, wait a little so a burst lands in one batch
+MAX_ATTEMPTS = 5
+
+log = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_workers = []
+
+
+def handler(kind):
+    """Register fn(payloads) for a job kind. It may return a callback run after commit."""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(kind, **payload):
+    """Queue a job in the current transaction; it runs once that commits."""
+    db.session.add(Job(kind=kind, payload=json.dumps(payload)))
+    _wake.set()
+
+
+# ---------- Handlers ----------
+@handler('reputation')
+def _apply_reputation(payloads):
+    points = Counter()
+    for p in payloads:
+        points[p['user_ID']] += p['points']
+    users = User.__table__
+    db.session.execute(
+        users.update().where(users.c.user_ID == bindparam('uid'))
+        .values(reputation_points=db.func.coalesce(users.c.reputation_points, 0) + bindparam('delta')),
+        [{'uid': uid, 'delta': delta} for uid, delta in points.items()])
+
+    def after_commit():
+        for uid, delta in points.items():
+            leaderboard_cache.add_points(uid, delta)
+            cache.invalidate_user(uid)
+    return after_commit
+
+
+@handler('upvote_count')
+def _apply_upvote_counts(payloads):
+    votes = Counter(p['answer_ID'] for p in payloads)
+    answers = Answer.__table__
+    db.session.execute(
+        answers.update().where(answers.c.answer_ID == bindparam('aid'))
+        .values(upvote_count=answers.c.upvote_count + bindparam('n')),
+        [{'aid': aid, 'n': n} for aid, n in votes.items()])
+    rows = (db.session.query(Answer.answer_ID, Answer.upvote_count, Answer.question_ID, Question.subject_ID)
+            .join(Question, Answer.question_ID == Question.question_ID)
+            .filter(Answer.answer_ID.in_(list(votes)))
+            .all())
+    for subject_id in {row.subject_ID for row in rows}:
+        versions.bump_subject(subject_id)
+
+    def after_commit():
+        for row in rows:
+            fragments.invalidate_question(row.question_ID)
+            hot.upvoted(row.question_ID, votes[row.answer_ID])
+            events.answer_upvoted(row, row.subject_ID, row.upvote_count)
+    return after_commit
+
+
+# ---------- Running jobs ----------
+def _apply(kind, claimed):
+    ids = [job.job_ID for job in claimed]
+    after_commit = HANDLERS[kind]([json.loads(job.payload) for job in claimed])
+    Job.query.filter(Job.job_ID.in_(ids)).delete(synchronize_session=False)
+    db.session.commit()
+    if after_commit:
+        after_commit()
+
+
+def _run_kind(kind, limit):
+    claimed = (Job.query.filter(Job.kind == kind, Job.attempts < MAX_ATTEMPTS)
+               .order_by(Job.job_ID).limit(limit)
+               .with_for_update(skip_locked=True).all())
+    if not claimed:
+        db.session.rollback()
+        return 0
+    ids = [job.job_ID for job in claimed]
+    try:
+        _apply(kind, claimed)
+        return len(ids)
+    except Exception:
+        db.session.rollback()
+        log.exception('job batch failed: %s x%d', kind, len(ids))
+
+    # Retry one by one so a bad job doesn't hold back the rest of its batch
+    done = 0
+    for job_id in ids:
+        job = Job.query.filter_by(job_ID=job_id).with_for_update(skip_locked=True).first()
+        if job is None:
+            db.session.rollback()
+            continue
+        try:
+            _apply(kind, [job])
+            done += 1
+        except Exception:
+            db.session.rollback()
+            log.exception('job %d (%s) failed', job_id, kind)
+            Job.query.filter_by(job_ID=job_id).update({Job.attempts: Job.attempts + 1}, synchronize_session=False)
+            db.session.commit()
+    return done
+
+
+def run_pending(limit=BATCH_SIZE):
+    """Run one batch of each kind. Returns the number of jobs applied."""
+    return sum(_run_kind(kind, limit) for kind in HANDLERS)
+
+
+def drain():
+    """Run batches until the queue is empty (or only failing jobs are left)."""
+    total = 0
+    while True:
+        done = run_pending()
+        if not done:
+            return total
+        total += done
+
+
+def pending_count():
+    return Job.query.filter(Job.attempts < MAX_ATTEMPTS).count()
+
+
+def _worker_loop(app):
+    while True:
+        if _wake.wait(POLL_SECONDS):
+            time.sleep(COALESCE_SECONDS)
+            _wake.clear()
+        with app.app_context():
+            try:
+                drain()
+            except Exception:
+                log.exception('job worker error')
+            finally:
+                db.session.remove()
+
+
+def start_workers(app, count):
+    """Start `count` daemon worker threads in this process (once)."""
+    with _start_lock:
+        if _workers:
+            return
+        for i in range(count):
+            thread = threading.Thread(target=_worker_loop, args=(app,), name=f'job-worker-{i}', daemon=True)
+            thread.start()
+            _workers.append(thread)
+
+
+def init_app(app):
+    # Threads are started on the first request, i.e. after any fork by the
+    # server, so every worker process gets its own pool. JOB_WORKERS=0 leaves
+    # the queue to `flask run-jobs`.
+    app.config.setdefault('JOB_WORKERS', 1)
+
+    @app.before_request
+    def _ensure_workers():
+        if not _workers and app.config['JOB_WORKERS']:
+            start_workers(app, app.config['JOB_WORKERS'])
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import namedtuple
+
+from models import db, User, Department
+
+# ---------------------------
+# Faculty leaderboard (process-local cache)
+# ---------------------------
+# The ranked faculty list is loaded once and kept in memory for CACHE_TTL
+# seconds. The reputation job (jobs.py) adjusts it in place via add_points(),
+# so dashboards can serve the top 5 without touching the database. Other
+# worker processes pick the change up when their copy expires.
+
+CACHE_TTL = 60  # seconds
+PAGE_SIZE = 25
+
+LeaderboardEntry = namedtuple(
+    'LeaderboardEntry',
+    'rank user_ID username reputation_points department_ID department_name',
+)
+
+_lock = threading.Lock()
+_cache = {'entries': [], 'loaded_at': None}
+
+
+def _rank(entries):
+    entries = sorted(entries, key=lambda e: (-e.reputation_points, e.user_ID))
+    return [e._replace(rank=i) for i, e in enumerate(entries, start=1)]
+
+
+def _load():
+    rows = (
+        db.session.query(User.user_ID, User.username, User.reputation_points,
+                         User.department_ID, Department.name)
+        .outerjoin(Department, User.department_ID == Department.department_ID)
+        .filter(User.role == 'faculty')
+        .order_by(User.reputation_points.desc(), User.user_ID)
+        .all()
+    )
+    return _rank(
+        LeaderboardEntry(0, user_id, username, points or 0, dept_id, dept_name)
+        for user_id, username, points, dept_id, dept_name in rows
+    )
+
+
+def ranked():
+    """The full faculty ranking, reloaded from the DB when the cache is stale."""
+    loaded_at = _cache['loaded_at']
+    if loaded_at is None or time.monotonic() - loaded_at > CACHE_TTL:
+        with _lock:
+            if _cache['loaded_at'] is None or time.monotonic() - _cache['loaded_at'] > CACHE_TTL:
+                _cache['entries'] = _load()
+                _cache['loaded_at'] = time.monotonic()
+    return _cache['entries']
+
+
+def top(n=5):
+    return ranked()[:n]
+
+
+def rank_of(user_id):
+    """A faculty member's overall rank, or None if they aren't ranked."""
+    for entry in ranked():
+        if entry.user_ID == user_id:
+            return entry.rank
+    return None
+
+
+def add_points(user_id, points):
+    """Apply a reputation change to the cached ranking without reloading it."""
+    with _lock:
+        if _cache['loaded_at'] is None:
+            return
+        entries = [
+            e._replace(reputation_points=e.reputation_points + points) if e.user_ID == user_id else e
+            for e in _cache['entries']
+        ]
+        _cache['entries'] = _rank(entries)
+
+
+def invalidate():
+    with _lock:
+        _cache['loaded_at'] = None
+
+
+def page(page_number=1, department_id=None, per_page=PAGE_SIZE):
+    """One page of the leaderboard, optionally ranked within a single department.
+
+    Returns (entries, stats) where stats has total/top_score/average/pages.
+    """
+    entries = ranked()
+    if department_id:
+        entries = _rank(e for e in entries if e.department_ID == department_id)
+
+    total = len(entries)
+    pages = max(1, -(-total // per_page))
+    page_number = max(1, min(page_number, pages))
+    start = (page_number - 1) * per_page
+
+    stats = {
+        'total': total,
+        'top_score': entries[0].reputation_points if entries else 0,
+        'average': round(sum(e.reputation_points for e in entries) / total) if total else 0,
+        'page': page_number,
+        'pages': pages,
+    }
+    return entries[start:start + per_page], stats
@@ -0,0 +1,229 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from models import db
+
+# ---------------------------
+# Versioned schema migrations
+# ---------------------------
+# Each step runs once and is recorded in `schema_migrations`. Steps are written
+# to be safe on a database that db.create_all() already built, so fresh dev
+# databases and old production ones converge on the same schema.
+# Run with: flask --app app db-upgrade
+
+MIGRATIONS = []
+
+
+def migration(version, name):
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+def _has_column(conn, table, column):
+    return column in [c['name'] for c in inspect(conn).get_columns(table)]
+
+
+def _create_indexes(conn, table_name):
+    table = db.metadata.tables[table_name]
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migration(1, 'baseline tables')
+def _baseline(conn):
+    db.metadata.create_all(conn, checkfirst=True)
+
+
+@migration(2, 'answer.upvote_count counter')
+def _answer_upvote_count(conn):
+    if not _has_column(conn, 'answer', 'upvote_count'):
+        conn.execute(text("ALTER TABLE answer ADD COLUMN upvote_count INTEGER NOT NULL DEFAULT 0"))
+    conn.execute(text(
+        "UPDATE answer SET upvote_count = "
+        "(SELECT COUNT(*) FROM upvote WHERE upvote.answer_ID = answer.answer_ID)"
+    ))
+
+
+@migration(3, 'hot path indexes and unique upvote')
+def _hot_path_indexes(conn):
+    # Drop duplicate votes (keep the first) so the unique index can be built
+    conn.execute(text(
+        "DELETE FROM upvote WHERE upvote_ID NOT IN ("
+        "SELECT keep_ID FROM (SELECT MIN(upvote_ID) AS keep_ID FROM upvote "
+        "GROUP BY user_ID, answer_ID) AS keep)"
+    ))
+    conn.execute(text(
+        "UPDATE answer SET upvote_count = "
+        "(SELECT COUNT(*) FROM upvote WHERE upvote.answer_ID = answer.answer_ID)"
+    ))
+    for table_name in ('user', 'question', 'answer', 'upvote', 'announcement', 'faculty_subject'):
+        _create_indexes(conn, table_name)
+
+
+@migration(4, 'full-text search index tables')
+def _search_tables(conn):
+    # Fill them afterwards with: flask --app app reindex-search
+    db.metadata.create_all(conn, tables=[db.metadata.tables['search_document'],
+                                         db.metadata.tables['search_posting']], checkfirst=True)
+
+
+@migration(5, 'search_document.norm for duplicate suggestions')
+def _search_document_norm(conn):
+    # Norms are filled by: flask --app app reindex-search
+    if not _has_column(conn, 'search_document', 'norm'):
+        conn.execute(text("ALTER TABLE search_document ADD COLUMN norm FLOAT NOT NULL DEFAULT 0"))
+
+
+@migration(6, 'content_version counters for conditional GET')
+def _content_version(conn):
+    db.metadata.create_all(conn, tables=[db.metadata.tables['content_version']], checkfirst=True)
+
+
+@migration(7, 'job queue table')
+def _job_table(conn):
+    db.metadata.create_all(conn, tables=[db.metadata.tables['job']], checkfirst=True)
+
+
+# (table, column, referenced table, referenced column)
+CASCADE_FOREIGN_KEYS = [
+    ('answer', 'question_ID', 'question', 'question_ID'),
+    ('upvote', 'answer_ID', 'answer', 'answer_ID'),
+    ('vote', 'answer_ID', 'answer', 'answer_ID'),
+    ('search_document', 'question_ID', 'question', 'question_ID'),
+    ('search_posting', 'question_ID', 'question', 'question_ID'),
+]
+
+
+@migration(8, 'ON DELETE CASCADE for question and answer children')
+def _cascade_foreign_keys(conn):
+    # SQLite can't alter constraints (and ignores them unless PRAGMA
+    # foreign_keys is on); moderation.py deletes children explicitly anyway.
+    if conn.dialect.name == 'sqlite':
+        return
+    quote = conn.dialect.identifier_preparer.quote
+    for table, column, ref_table, ref_column in CASCADE_FOREIGN_KEYS:
+        for fk in inspect(conn).get_foreign_keys(table):
+            if fk['constrained_columns'] != [column] or fk.get('options', {}).get('ondelete') == 'CASCADE':
+                continue
+            name = quote(fk['name'])
+            conn.execute(text(f"ALTER TABLE {quote(table)} DROP FOREIGN KEY {name}"))
+            conn.execute(text(
+                f"ALTER TABLE {quote(table)} ADD CONSTRAINT {name} FOREIGN KEY ({quote(column)}) "
+                f"REFERENCES {quote(ref_table)} ({quote(ref_column)}) ON DELETE CASCADE"
+            ))
+
+
+@migration(9, 'archive tables for old semesters')
+def _archive_tables(conn):
+    db.metadata.create_all(conn, tables=[db.metadata.tables[name] for name in
+                                         ('question_archive', 'answer_archive', 'upvote_archive')],
+                           checkfirst=True)
+
+
+@migration(10, 'user_summary for dashboards')
+def _user_summary(conn):
+    # Rows are filled lazily on first dashboard visit, or all at once by:
+    # flask --app app rebuild-summaries
+    db.metadata.create_all(conn, tables=[db.metadata.tables['user_summary']], checkfirst=True)
+
+
+@migration(11, 'search_term document frequencies')
+def _search_term(conn):
+    db.metadata.create_all(conn, tables=[db.metadata.tables['search_term']], checkfirst=True)
+    conn.execute(text("DELETE FROM search_term"))
+    conn.execute(text(
+        "INSERT INTO search_term (term, doc_freq) "
+        "SELECT term, COUNT(*) FROM search_posting GROUP BY term"
+    ))
+
+
+@migration(12, 'search_posting.subject_ID for subject-scoped lookups')
+def _search_posting_subject(conn):
+    if not _has_column(conn, 'search_posting', 'subject_ID'):
+        conn.execute(text("ALTER TABLE search_posting ADD COLUMN subject_ID INTEGER NULL"))
+    conn.execute(text(
+        "UPDATE search_posting SET subject_ID = "
+        "(SELECT subject_ID FROM search_document WHERE search_document.question_ID = search_posting.question_ID)"
+    ))
+    _create_indexes(conn, 'search_posting')
+
+
+@migration(13, 'event_log for cross-process live updates')
+def _event_log(conn):
+    db.metadata.create_all(conn, tables=[db.metadata.tables['event_log']], checkfirst=True)
+
+
+@migration(14, 'search_posting (term, term_freq) index for bounded search')
+def _search_posting_term_tf(conn):
+    _create_indexes(conn, 'search_posting')
+
+
+def upgrade():
+    """Apply every pending migration in order. Returns the versions applied."""
+    applied_now = []
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, applied_at DATETIME NOT NULL)"
+        ))
+        done = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+    for version, name, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in done:
+            continue
+        with db.engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {'v': version, 'n': name, 't': datetime.utcnow()},
+            )
+        applied_now.append(version)
+    return applied_now
+
+
+# ---------------------------
+# EXPLAIN checks for hot queries
+# ---------------------------
+# (description, SQL, params, index that should serve it)
+HOT_QUERIES = [
+    ('feed page', "SELECT * FROM question ORDER BY created_at DESC, question_ID DESC LIMIT 20",
+     {}, 'ix_question_created'),
+    ('questions by subject', "SELECT * FROM question WHERE subject_ID = :id ORDER BY created_at DESC",
+     {'id': 1}, 'ix_question_subject_created'),
+    ('my questions', "SELECT * FROM question WHERE student_ID = :id ORDER BY created_at DESC",
+     {'id': 1}, 'ix_question_student_created'),
+    ('answers for question', "SELECT * FROM answer WHERE question_ID = :id",
+     {'id': 1}, 'ix_answer_question'),
+    ('has voted', "SELECT upvote_ID FROM upvote WHERE user_ID = :u AND answer_ID = :a",
+     {'u': 1, 'a': 1}, 'uq_upvote_user_answer'),
+    ('department announcements', "SELECT * FROM announcement WHERE department_ID = :id ORDER BY created_at DESC",
+     {'id': 1}, 'ix_announcement_dept_created'),
+    ('faculty subjects', "SELECT subject_ID FROM faculty_subject WHERE faculty_ID = :id",
+     {'id': 1}, 'ix_faculty_subject_faculty'),
+    ('faculty leaderboard', "SELECT * FROM user WHERE role = 'faculty' ORDER BY reputation_points DESC LIMIT 5",
+     {}, 'ix_user_role_reputation'),
+    ('similar questions', "SELECT question_ID, term_freq FROM search_posting WHERE term = :t AND subject_ID = :id",
+     {'t': 'join', 'id': 1}, 'ix_search_posting_term_subject'),
+]
+
+
+def explain_index(conn, sql, params):
+    """Return the plan text for a query (used to spot which index it picked)."""
+    if conn.dialect.name == 'sqlite':
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params).fetchall()
+        return ' '.join(str(row[-1]) for row in rows)
+    rows = conn.execute(text("EXPLAIN " + sql), params).mappings().fetchall()
+    return ' '.join(str(row.get('key')) for row in rows)
+
+
+def check_indexes():
+    """Run EXPLAIN on every hot query; returns [(description, ok, plan)]."""
+    results = []
+    with db.engine.connect() as conn:
+        for description, sql, params, index_name in HOT_QUERIES:
+            plan = explain_index(conn, sql, params)
+            results.append((description, index_name in plan, plan))
+    return results
@@ -2,7 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
 
-db = SQLAlchemy()
+from routing import RoutingSession
+
+# Reads from @read_only views may go to a replica (see routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # ---------------------------
 # 1. User Table
@@ -18,6 +21,10 @@ class User(db.Model, UserMixin):
     department_ID = db.Column(db.Integer, db.ForeignKey('department.department_ID'), nullable=True)
     reputation_points = db.Column(db.Integer, default=0)
 
+    __table_args__ = (
+        db.Index('ix_user_role_reputation', 'role', 'reputation_points'),
+    )
+
     # Relationships
     questions = db.relationship('Question', backref='user', lazy=True)
     answers = db.relationship('Answer', backref='user', lazy=True)
@@ -73,8 +80,16 @@ class Question(db.Model):
 
     is_answered = db.Column(db.Boolean, default=False)
 
-    # Relationships
-    answers = db.relationship('Answer', backref='question', lazy=True)
+    __table_args__ = (
+        db.Index('ix_question_created', 'created_at', 'question_ID'),
+        db.Index('ix_question_subject_created', 'subject_ID', 'created_at'),
+        db.Index('ix_question_student_created', 'student_ID', 'created_at'),
+    )
+
+    # Relationships (answers, their votes and the search rows go with the
+    # question: ON DELETE CASCADE in the database, delete-orphan in the ORM)
+    answers = db.relationship('Answer', backref='question', lazy=True,
+                              cascade='all, delete-orphan', passive_deletes=True)
 
 
 
@@ -86,18 +101,31 @@ class Answer(db.Model):
     __tablename__ = 'answer'
 
     answer_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    question_ID = db.Column(db.Integer, db.ForeignKey('question.question_ID'), nullable=False)
+    question_ID = db.Column(db.Integer, db.ForeignKey('question.question_ID', ondelete='CASCADE'), nullable=False)
     faculty_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Denormalized count of Upvote rows, bumped by the upvote_count job (jobs.py).
+    # Rebuild with `flask reconcile-upvotes` if it ever drifts.
+    upvote_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('ix_answer_question', 'question_ID', 'created_at'),
+    )
+
+    upvotes = db.relationship('Upvote', backref='answer', lazy=True,
+                              cascade='all, delete-orphan', passive_deletes=True)
+    votes = db.relationship('Vote', backref='answer', lazy=True,
+                            cascade='all, delete-orphan', passive_deletes=True)
+
 
 
 class Vote(db.Model):
     __tablename__ = 'vote'
     vote_ID = db.Column(db.Integer, primary_key=True)
     user_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
-    answer_ID = db.Column(db.Integer, db.ForeignKey('answer.answer_ID'), nullable=False)
+    answer_ID = db.Column(db.Integer, db.ForeignKey('answer.answer_ID', ondelete='CASCADE'), nullable=False)
     vote_type = db.Column(db.String(10), nullable=False)  # 'upvote' or 'downvote'
 
 # ---------------------------
@@ -113,6 +141,10 @@ class Announcement(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_announcement_dept_created', 'department_ID', 'created_at'),
+    )
+
     # Relationships for easier template access
     faculty = db.relationship('User', backref='announcements', foreign_keys=[faculty_ID])
     department = db.relationship('Department', backref='announcements', foreign_keys=[department_ID])
@@ -124,9 +156,15 @@ class Upvote(db.Model):
     __tablename__ = 'upvote'
 
     upvote_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    answer_ID = db.Column(db.Integer, db.ForeignKey('answer.answer_ID'), nullable=False) 
+    answer_ID = db.Column(db.Integer, db.ForeignKey('answer.answer_ID', ondelete='CASCADE'), nullable=False) 
     user_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
 
+    # One vote per student per answer; also the lookup index for "has this user voted"
+    __table_args__ = (
+        db.Index('uq_upvote_user_answer', 'user_ID', 'answer_ID', unique=True),
+        db.Index('ix_upvote_answer', 'answer_ID'),
+    )
+
 # ---------------------------
 # 8. Faculty_Subject Table
 # ---------------------------
@@ -136,3 +174,175 @@ class FacultySubject(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     faculty_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
     subject_ID = db.Column(db.Integer, db.ForeignKey('subject.subject_ID'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_faculty_subject_faculty', 'faculty_ID', 'subject_ID'),
+    )
+
+# ---------------------------
+# 9. Search Index Tables
+# ---------------------------
+# Inverted index over question title/description and answer text (see search.py)
+class SearchDocument(db.Model):
+    __tablename__ = 'search_document'
+
+    question_ID = db.Column(db.Integer, db.ForeignKey('question.question_ID', ondelete='CASCADE'), primary_key=True)
+    subject_ID = db.Column(db.Integer, db.ForeignKey('subject.subject_ID'), nullable=False)
+    length = db.Column(db.Integer, nullable=False)
+    # Euclidean norm of the TF-IDF vector, for cosine similarity against new questions
+    norm = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+
+    __table_args__ = (
+        db.Index('ix_search_document_subject', 'subject_ID'),
+    )
+
+
+class SearchPosting(db.Model):
+    __tablename__ = 'search_posting'
+
+    term = db.Column(db.String(64), primary_key=True)
+    question_ID = db.Column(db.Integer, db.ForeignKey('question.question_ID', ondelete='CASCADE'), primary_key=True)
+    term_freq = db.Column(db.Integer, nullable=False)
+    # Copied from the question so subject-scoped lookups stay on this table's index
+    subject_ID = db.Column(db.Integer, db.ForeignKey('subject.subject_ID'), nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_search_posting_question', 'question_ID'),
+        db.Index('ix_search_posting_term_subject', 'term', 'subject_ID', 'term_freq'),
+        db.Index('ix_search_posting_term_tf', 'term', 'term_freq'),
+    )
+
+
+# Number of indexed questions containing each term, kept in step with the
+# postings so IDF is a primary-key lookup rather than a COUNT over them
+class SearchTerm(db.Model):
+    __tablename__ = 'search_term'
+
+    term = db.Column(db.String(64), primary_key=True)
+    doc_freq = db.Column(db.Integer, nullable=False, default=0)
+
+# ---------------------------
+# 10. Content Versions
+# ---------------------------
+# A counter per department (announcements) and per subject (questions,
+# answers, upvotes), bumped in the same transaction as the write. Pages
+# derive their ETag from it (see versions.py).
+class ContentVersion(db.Model):
+    __tablename__ = 'content_version'
+
+    scope = db.Column(db.String(20), primary_key=True)
+    scope_ID = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# ---------------------------
+# 11. Background Job Queue
+# ---------------------------
+# Side effects of a request (reputation, counters) are queued here in the
+# request's own transaction and applied in batches by jobs.py.
+class Job(db.Model):
+    __tablename__ = 'job'
+
+    job_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(40), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_job_attempts', 'attempts', 'job_ID'),
+    )
+
+# ---------------------------
+# 12. Archive Tables
+# ---------------------------
+# Old semesters' questions, answers and upvotes, moved out of the live tables
+# by archive.py. Same columns as the originals (IDs kept) plus the semester
+# label; read-only from the app's point of view.
+class QuestionArchive(db.Model):
+    __tablename__ = 'question_archive'
+
+    question_ID = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    student_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
+    subject_ID = db.Column(db.Integer, db.ForeignKey('subject.subject_ID'), nullable=False)
+    is_answered = db.Column(db.Boolean, default=False)
+    semester = db.Column(db.String(40), nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_question_archive_subject_created', 'subject_ID', 'created_at'),
+        db.Index('ix_question_archive_created', 'created_at', 'question_ID'),
+    )
+
+    user = db.relationship('User', foreign_keys=[student_ID])
+    subject = db.relationship('Subject', foreign_keys=[subject_ID])
+    answers = db.relationship('AnswerArchive', backref='question', lazy=True)
+
+
+class AnswerArchive(db.Model):
+    __tablename__ = 'answer_archive'
+
+    answer_ID = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    question_ID = db.Column(db.Integer, db.ForeignKey('question_archive.question_ID'), nullable=False)
+    faculty_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    upvote_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    __table_args__ = (
+        db.Index('ix_answer_archive_question', 'question_ID', 'created_at'),
+    )
+
+    user = db.relationship('User', foreign_keys=[faculty_ID])
+
+
+class UpvoteArchive(db.Model):
+    __tablename__ = 'upvote_archive'
+
+    upvote_ID = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    answer_ID = db.Column(db.Integer, db.ForeignKey('answer_archive.answer_ID'), nullable=False)
+    user_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_upvote_archive_answer', 'answer_ID'),
+    )
+
+# ---------------------------
+# 13. Dashboard Summaries
+# ---------------------------
+# Per-user counts behind the dashboards, kept up to date by the write routes
+# (see summaries.py). Rows marked stale are recomputed on the next visit.
+class UserSummary(db.Model):
+    __tablename__ = 'user_summary'
+
+    user_ID = db.Column(db.Integer, db.ForeignKey('user.user_ID', ondelete='CASCADE'), primary_key=True)
+    # Students: their own questions. Faculty: questions in the subjects they teach.
+    open_questions = db.Column(db.Integer, nullable=False, default=0)
+    answered_questions = db.Column(db.Integer, nullable=False, default=0)
+    unread_announcements = db.Column(db.Integer, nullable=False, default=0)
+    announcements_seen_at = db.Column(db.DateTime, nullable=True)
+    stale = db.Column(db.Boolean, nullable=False, default=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# ---------------------------
+# 14. Live Update Events
+# ---------------------------
+# Recent server-sent events, so /events clients on any worker get them
+# (see events.py). Rows are trimmed after a few minutes.
+class EventLog(db.Model):
+    __tablename__ = 'event_log'
+
+    event_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.String(20), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    department_ID = db.Column(db.Integer, nullable=True)
+    subject_ID = db.Column(db.Integer, nullable=True)
+    user_ID = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_event_log_created', 'created_at'),
+    )
@@ -0,0 +1,129 @@
+from sqlalchemy import delete, select
+
+from models import db, Question, Answer, Upvote, Vote, Announcement, SearchDocument, SearchPosting
+import hot
+import search
+import summaries
+import versions
+import votes
+
+# ---------------------------
+# Set-based deletes for moderation
+# ---------------------------
+# Each delete is one statement per table, children first, selected with a
+# subquery on the question (or answer) filter. Nothing is loaded into the
+# session, so removing a whole subject costs a handful of statements instead
+# of a row-by-row ORM cascade. The ON DELETE CASCADE foreign keys cover the
+# same ground on MySQL; deleting children explicitly keeps SQLite (which
+# doesn't enforce them by default) consistent too.
+
+# Deletes of up to this many questions take them out of the hot ranking one
+# by one; bigger ones (and subject purges) make it reload instead.
+HOT_REMOVE_LIMIT = 100
+
+
+class ModerationError(ValueError):
+    pass
+
+
+def _as_int(name, value):
+    # JSON booleans are ints to Python; don't let true/false through as 1/0
+    if isinstance(value, bool):
+        raise ModerationError(f'{name} must be an integer')
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ModerationError(f'{name} must be an integer')
+
+
+def _as_int_list(name, value):
+    if not isinstance(value, list):
+        raise ModerationError(f'{name} must be a list of integers')
+    return [_as_int(name, item) for item in value]
+
+
+def parse_request(data, ids_key, scope_key):
+    """(IDs, scope ID or None) from a moderation JSON body; raises ModerationError on bad input."""
+    if not isinstance(data, dict):
+        raise ModerationError('Expected a JSON object')
+    ids = _as_int_list(ids_key, data.get(ids_key) or [])
+    scope_id = data.get(scope_key)
+    if scope_id is not None:
+        scope_id = _as_int(scope_key, scope_id)
+    if not ids and scope_id is None:
+        raise ModerationError(f'Give {ids_key} or {scope_key}')
+    return ids, scope_id
+
+
+def _delete_questions_where(criterion):
+    subject_ids = [row[0] for row in db.session.execute(
+        select(Question.subject_ID).where(criterion).distinct())]
+    student_ids = [row[0] for row in db.session.execute(
+        select(Question.student_ID).where(criterion).distinct())]
+    question_ids = select(Question.question_ID).where(criterion)
+    answer_ids = select(Answer.answer_ID).where(Answer.question_ID.in_(question_ids))
+    voter_ids = [row[0] for row in db.session.execute(
+        select(Upvote.user_ID).where(Upvote.answer_ID.in_(answer_ids)).distinct())]
+
+    search.release_terms(question_ids)
+    statements = [
+        ('upvote', delete(Upvote).where(Upvote.answer_ID.in_(answer_ids))),
+        ('vote', delete(Vote).where(Vote.answer_ID.in_(answer_ids))),
+        ('search_posting', delete(SearchPosting).where(SearchPosting.question_ID.in_(question_ids))),
+        ('search_document', delete(SearchDocument).where(SearchDocument.question_ID.in_(question_ids))),
+        ('answer', delete(Answer).where(Answer.question_ID.in_(question_ids))),
+        ('question', delete(Question).where(criterion)),
+    ]
+    counts = {}
+    for table, statement in statements:
+        counts[table] = db.session.execute(statement, execution_options={'synchronize_session': False}).rowcount
+    for subject_id in subject_ids:
+        versions.bump_subject(subject_id)
+    summaries.invalidate_users(student_ids)
+    summaries.invalidate_subjects(subject_ids)
+    for user_id in voter_ids:
+        votes.forget(user_id)
+    return counts
+
+
+def delete_questions(question_ids):
+    """Delete questions with their answers, votes and search rows. Returns rows deleted per table.
+
+    The caller commits.
+    """
+    question_ids = [int(q) for q in question_ids]
+    if not question_ids:
+        return {}
+    counts = _delete_questions_where(Question.question_ID.in_(question_ids))
+    if len(question_ids) <= HOT_REMOVE_LIMIT:
+        hot.questions_deleted(question_ids)
+    else:
+        hot.invalidate()
+    return counts
+
+
+def purge_subject(subject_id):
+    """Delete every question (and what hangs off it) in one subject. The caller commits."""
+    counts = _delete_questions_where(Question.subject_ID == subject_id)
+    hot.invalidate()
+    return counts
+
+
+def delete_announcements(announcement_ids=None, department_id=None):
+    """Delete announcements by ID and/or a whole department's. The caller commits."""
+    criteria = []
+    if announcement_ids:
+        criteria.append(Announcement.announcement_ID.in_([int(a) for a in announcement_ids]))
+    if department_id is not None:
+        criteria.append(Announcement.department_ID == department_id)
+    if not criteria:
+        return {}
+    criterion = db.or_(*criteria)
+    department_ids = [row[0] for row in db.session.execute(
+        select(Announcement.department_ID).where(criterion).distinct())]
+    deleted = db.session.execute(delete(Announcement).where(criterion),
+                                 execution_options={'synchronize_session': False}).rowcount
+    for dept_id in department_ids:
+        versions.bump_department(dept_id)
+        summaries.invalidate_department(dept_id)
+    return {'announcement': deleted}
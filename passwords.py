@@ -0,0 +1,164 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+# ---------------------------
+# Password hashing off the request thread
+# ---------------------------
+# Hashing is deliberately slow, so register/login hand it to a small process
+# pool instead of burning a request thread (and the GIL) on it. Admission is
+# bounded: at most PASSWORD_HASH_WORKERS jobs run and PASSWORD_HASH_QUEUE
+# more wait; past that the route answers 503 with Retry-After rather than
+# letting a login storm queue up behind every page view.
+#
+#   PASSWORD_HASH_METHOD    werkzeug method, e.g. scrypt or pbkdf2:sha256:600000
+#   PASSWORD_HASH_WORKERS   pool processes per app process (0 = hash inline)
+#   PASSWORD_HASH_QUEUE     jobs allowed to wait for a free process
+#
+# When the method changes, a user's stored hash is upgraded the next time
+# they log in (needs_rehash).
+
+DEFAULT_METHOD = 'scrypt'
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 8
+TIMEOUT_SECONDS = 10
+RETRY_AFTER_SECONDS = 2
+
+
+class HashingBusy(Exception):
+    """The pool is saturated; the caller should answer 503."""
+
+
+def _method_tag(method):
+    # The prefix werkzeug writes before the first '$' for this method, with its
+    # defaults filled in the same way ("scrypt" -> "scrypt:32768:8:1")
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n, r, p = map(int, args) if args else (2 ** 15, 8, 1)
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2' and len(args) <= 2:
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f'Unsupported PASSWORD_HASH_METHOD: {method}')
+
+
+_config = {'method': DEFAULT_METHOD, 'tag': _method_tag(DEFAULT_METHOD),
+           'workers': DEFAULT_WORKERS, 'queue': DEFAULT_QUEUE}
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_slots = threading.BoundedSemaphore(DEFAULT_WORKERS + DEFAULT_QUEUE)
+_stats = {'in_flight': 0, 'max_in_flight': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0, 'total_ms': 0.0}
+
+
+def configure(method=DEFAULT_METHOD, workers=DEFAULT_WORKERS, queue=DEFAULT_QUEUE):
+    global _slots
+    tag = _method_tag(method)
+    shutdown()
+    with _lock:
+        _config.update(method=method, tag=tag, workers=workers, queue=queue)
+        _slots = threading.BoundedSemaphore(max(1, workers + queue))
+
+
+def _get_pool():
+    # Created on first use, i.e. after the server forks, one pool per process
+    global _pool, _pool_pid
+    with _lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=_config['workers'])
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None and _pool_pid == os.getpid():
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _run(fn, *args):
+    if not _config['workers']:
+        return fn(*args)
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            _stats['rejected'] += 1
+        raise HashingBusy()
+
+    started = time.perf_counter()
+    with _lock:
+        _stats['in_flight'] += 1
+        _stats['max_in_flight'] = max(_stats['max_in_flight'], _stats['in_flight'])
+    try:
+        future = _get_pool().submit(fn, *args)
+        try:
+            result = future.result(timeout=TIMEOUT_SECONDS)
+        except FutureTimeout:
+            future.cancel()
+            with _lock:
+                _stats['timeouts'] += 1
+            raise HashingBusy()
+        except BrokenProcessPool:
+            # A worker died (OOM kill etc.); start a fresh pool next time
+            shutdown()
+            raise HashingBusy()
+    finally:
+        _slots.release()
+        with _lock:
+            _stats['in_flight'] -= 1
+    with _lock:
+        _stats['completed'] += 1
+        _stats['total_ms'] += (time.perf_counter() - started) * 1000
+    return result
+
+
+def hash_password(password):
+    """Hash with the configured method. Raises HashingBusy when saturated."""
+    return _run(generate_password_hash, password, _config['method'])
+
+
+def verify(password_hash, password):
+    """check_password_hash in the pool. Raises HashingBusy when saturated."""
+    return _run(check_password_hash, password_hash, password)
+
+
+def configured_method():
+    """The werkzeug method new hashes use (for hashing in another pool, e.g. bulk imports)."""
+    return _config['method']
+
+
+def needs_rehash(password_hash):
+    """True if the hash was made with a method or parameters other than the configured ones."""
+    return password_hash.split('$', 1)[0] != _config['tag']
+
+
+def stats():
+    """Pool load for /debug/hashing."""
+    with _lock:
+        snapshot = dict(_stats)
+        config = dict(_config)
+    in_flight = snapshot.pop('in_flight')
+    total_ms = snapshot.pop('total_ms')
+    return {
+        'method': config['method'],
+        'workers': config['workers'],
+        'queue_limit': config['queue'],
+        'running': min(in_flight, config['workers']),
+        'queued': max(0, in_flight - config['workers']),
+        'avg_ms': round(total_ms / snapshot['completed'], 2) if snapshot['completed'] else 0.0,
+        **snapshot,
+    }
+
+
+def init_app(app):
+    app.config.setdefault('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    app.config.setdefault('PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+    app.config.setdefault('PASSWORD_HASH_QUEUE', DEFAULT_QUEUE)
+    configure(app.config['PASSWORD_HASH_METHOD'], app.config['PASSWORD_HASH_WORKERS'],
+              app.config['PASSWORD_HASH_QUEUE'])
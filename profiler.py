@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import defaultdict, deque
+
+from flask import g, has_request_context, request, template_rendered, before_render_template
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ---------------------------
+# Request-scoped SQL / render profiler
+# ---------------------------
+# Every request records its query count, DB time, slowest statements and
+# template render time. The numbers go out as a Server-Timing header and are
+# kept in a rolling window per endpoint for /debug/perf.
+
+WINDOW = 500          # requests kept per endpoint
+SLOWEST_KEPT = 3      # statements reported per request
+SLOW_LOG_SIZE = 50    # slowest statements kept per endpoint
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_slow_statements = defaultdict(list)
+
+
+# ---------- SQLAlchemy engine events ----------
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    if not has_request_context() or 'perf' not in g:
+        return
+    perf = g.perf
+    perf['queries'] += 1
+    perf['db_time'] += elapsed
+    perf['statements'].append((elapsed, statement))
+
+
+# ---------- Template render timing ----------
+# Cached fragments render templates from inside the page template, so renders
+# nest; only the outermost one is added to render_time.
+def _render_started(sender, template, context, **extra):
+    if has_request_context() and 'perf' in g:
+        g.perf['render_stack'].append(time.perf_counter())
+
+
+def _render_finished(sender, template, context, **extra):
+    if has_request_context() and 'perf' in g and g.perf['render_stack']:
+        started = g.perf['render_stack'].pop()
+        if not g.perf['render_stack']:
+            g.perf['render_time'] += time.perf_counter() - started
+
+
+def _percentiles(values):
+    ordered = sorted(values)
+    if not ordered:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+    return {'p50': round(pick(50), 2), 'p95': round(pick(95), 2), 'p99': round(pick(99), 2)}
+
+
+def init_app(app):
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
+
+    @app.before_request
+    def _start_request_timer():
+        g.perf = {'start': time.perf_counter(), 'queries': 0, 'db_time': 0.0,
+                  'render_time': 0.0, 'render_stack': [], 'statements': []}
+
+    @app.after_request
+    def _record_request(response):
+        perf = g.pop('perf', None)
+        if perf is None:
+            return response
+        total = time.perf_counter() - perf['start']
+        slowest = sorted(perf['statements'], key=lambda s: s[0], reverse=True)[:SLOWEST_KEPT]
+
+        response.headers['Server-Timing'] = ', '.join([
+            f'db;dur={perf["db_time"] * 1000:.1f};desc="{perf["queries"]} queries"',
+            f'render;dur={perf["render_time"] * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+        endpoint = request.endpoint or 'unknown'
+        with _lock:
+            _samples[endpoint].append((total, perf['db_time'], perf['queries'], perf['render_time']))
+            if slowest:
+                log = _slow_statements[endpoint] + slowest
+                _slow_statements[endpoint] = sorted(log, key=lambda s: s[0], reverse=True)[:SLOW_LOG_SIZE]
+        return response
+
+
+def snapshot():
+    """Per-endpoint rolling stats (times in milliseconds) for /debug/perf."""
+    with _lock:
+        samples = {endpoint: list(rows) for endpoint, rows in _samples.items()}
+        slow = {endpoint: list(rows) for endpoint, rows in _slow_statements.items()}
+
+    report = {}
+    for endpoint, rows in samples.items():
+        totals = [r[0] * 1000 for r in rows]
+        db_times = [r[1] * 1000 for r in rows]
+        queries = [r[2] for r in rows]
+        renders = [r[3] * 1000 for r in rows]
+        report[endpoint] = {
+            'requests': len(rows),
+            'total_ms': _percentiles(totals),
+            'db_ms': _percentiles(db_times),
+            'render_ms': _percentiles(renders),
+            'queries': {'avg': round(sum(queries) / len(queries), 2), 'max': max(queries)},
+            'slowest_statements': [
+                {'ms': round(elapsed * 1000, 2), 'sql': statement}
+                for elapsed, statement in slow.get(endpoint, [])[:SLOWEST_KEPT]
+            ],
+        }
+    return report
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _slow_statements.clear()
@@ -0,0 +1,85 @@
+import functools
+import random
+import time
+
+from flask import g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+
+# ---------------------------
+# Connection pool and read replicas
+# ---------------------------
+# Pool settings and replica URLs come from the environment:
+#
+#   DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE (seconds), DB_POOL_PRE_PING (1/0)
+#   DATABASE_REPLICA_URLS   comma-separated replica URLs
+#
+# Replicas are registered as SQLAlchemy binds named replica_0, replica_1, ...
+# Views decorated with @read_only run their queries on one replica picked per
+# request; everything else (and every flush) goes to the primary. After a
+# write request the user's session sticks to the primary for a few seconds,
+# so they always see their own post/answer/vote on the next page.
+
+REPLICA_PREFIX = 'replica_'
+STICKY_SECONDS = 5
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+def engine_options(environ):
+    """SQLALCHEMY_ENGINE_OPTIONS from DB_POOL_* variables (unset ones keep the defaults)."""
+    options = {'pool_pre_ping': environ.get('DB_POOL_PRE_PING', '1') == '1'}
+    for name, key in (('DB_POOL_SIZE', 'pool_size'), ('DB_MAX_OVERFLOW', 'max_overflow'),
+                      ('DB_POOL_RECYCLE', 'pool_recycle')):
+        if environ.get(name):
+            options[key] = int(environ[name])
+    options.setdefault('pool_recycle', 3600)  # below MySQL's default wait_timeout
+    return options
+
+
+def replica_binds(environ):
+    """SQLALCHEMY_BINDS entries for DATABASE_REPLICA_URLS."""
+    urls = [url.strip() for url in environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    return {f'{REPLICA_PREFIX}{i}': url for i, url in enumerate(urls)}
+
+
+class RoutingSession(Session):
+    """db.session that sends @read_only views to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        # INSERT/UPDATE/DELETE always go to the primary, even from a read-only view
+        is_write = self._flushing or getattr(clause, 'is_dml', False)
+        if bind is None and not is_write and has_request_context() and g.get('use_replica'):
+            replica = _replica_for_request(self._db.engines)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _replica_for_request(engines):
+    # One replica per request, so a page never mixes two replicas' lag
+    if 'replica_engine' not in g:
+        replicas = [engine for key, engine in engines.items() if key and key.startswith(REPLICA_PREFIX)]
+        g.replica_engine = random.choice(replicas) if replicas else None
+    return g.replica_engine
+
+
+def _sticky_to_primary():
+    return session.get('primary_until', 0) > time.time()
+
+
+def read_only(view):
+    """Run a view's queries on a replica, unless the user just wrote something."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_replica = not _sticky_to_primary()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def init_app(app):
+    app.config.setdefault('REPLICA_STICKY_SECONDS', STICKY_SECONDS)
+
+    @app.after_request
+    def _stick_after_write(response):
+        if request.method in WRITE_METHODS:
+            session['primary_until'] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+        return response
@@ -0,0 +1,363 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from feed import eager_question_options
+from models import db, Question, Answer, SearchDocument, SearchPosting, SearchTerm
+import cache
+
+# ---------------------------
+# Full-text search (BM25 over an inverted index)
+# ---------------------------
+# Each question is one document: title (counted twice), description and the
+# text of its answers. Postings live in the search_posting table keyed on
+# (term, question_ID), so a search reads only the postings for its terms and
+# never scans the question table. search_term keeps each term's document
+# frequency, adjusted by the same writes that add or drop postings. The write
+# routes call index_question() inside their own transaction; deletes (which
+# all go through moderation.py, including archiving) call release_terms()
+# and then drop the postings and documents with set-based statements.
+#
+# A search scores at most MAX_POSTINGS_PER_TERM postings per term, the ones
+# with the highest term frequency (read in order off an index), so a common
+# term costs the same at 100k questions as at 1k. Documents past that cut
+# would rank low for the term anyway.
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+MAX_QUERY_TERMS = 10
+PAGE_SIZE = 20
+MAX_POSTINGS_PER_TERM = 1000
+STATS_TTL = 60  # seconds to reuse the corpus size / average length
+SIMILAR_LIMIT = 5
+SIMILAR_MIN_SCORE = 0.35
+SIMILAR_POSTINGS_PER_TERM = 300
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for', 'from', 'how',
+    'i', 'in', 'is', 'it', 'of', 'on', 'or', 'the', 'this', 'to', 'what', 'when', 'why', 'with',
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_stats_lock = threading.Lock()
+_stats = {'value': None, 'loaded_at': 0.0}
+
+
+def tokenize(text):
+    return [t[:64] for t in _TOKEN_RE.findall((text or '').lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def _document_terms(question, answers):
+    terms = Counter()
+    for _ in range(TITLE_WEIGHT):
+        terms.update(tokenize(question.title))
+    terms.update(tokenize(question.description))
+    for answer in answers:
+        terms.update(tokenize(answer.content))
+    return terms
+
+
+def _idf(doc_count, df):
+    return math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+
+def _tfidf_weight(tf, idf):
+    return (1 + math.log(tf)) * idf
+
+
+def _doc_freq(terms):
+    # Document frequency over the whole corpus (primary-key lookups on search_term)
+    if not terms:
+        return {}
+    return dict(
+        db.session.query(SearchTerm.term, SearchTerm.doc_freq)
+        .filter(SearchTerm.term.in_(list(terms)))
+        .all()
+    )
+
+
+def _add_doc_freq(terms):
+    # One more document for each term; rows for new terms are created
+    terms = sorted(terms)
+    if not terms:
+        return
+    existing = [row[0] for row in db.session.query(SearchTerm.term)
+                .filter(SearchTerm.term.in_(terms)).with_for_update()]
+    if existing:
+        SearchTerm.query.filter(SearchTerm.term.in_(existing)).update(
+            {SearchTerm.doc_freq: SearchTerm.doc_freq + 1}, synchronize_session=False)
+    missing = sorted(set(terms) - set(existing))
+    if not missing:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.bulk_insert_mappings(SearchTerm, [{'term': term, 'doc_freq': 1} for term in missing])
+    except IntegrityError:
+        # Another request created some of them first
+        for term in missing:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(SearchTerm(term=term, doc_freq=1))
+            except IntegrityError:
+                SearchTerm.query.filter_by(term=term).update(
+                    {SearchTerm.doc_freq: SearchTerm.doc_freq + 1}, synchronize_session=False)
+
+
+def _drop_doc_freq(terms):
+    if terms:
+        SearchTerm.query.filter(SearchTerm.term.in_(sorted(terms))).update(
+            {SearchTerm.doc_freq: SearchTerm.doc_freq - 1}, synchronize_session=False)
+
+
+def _delete_rows(question_id):
+    # Returns the terms the question was indexed under and its length (None if it wasn't)
+    terms = {row[0] for row in db.session.query(SearchPosting.term).filter_by(question_ID=question_id)}
+    length = db.session.query(SearchDocument.length).filter_by(question_ID=question_id).scalar()
+    SearchPosting.query.filter_by(question_ID=question_id).delete(synchronize_session=False)
+    SearchDocument.query.filter_by(question_ID=question_id).delete(synchronize_session=False)
+    return terms, length
+
+
+def _write_rows(question, terms, norm):
+    db.session.add(SearchDocument(
+        question_ID=question.question_ID,
+        subject_ID=question.subject_ID,
+        length=sum(terms.values()),
+        norm=norm,
+    ))
+    db.session.bulk_insert_mappings(SearchPosting, [
+        {'term': term, 'question_ID': question.question_ID, 'subject_ID': question.subject_ID, 'term_freq': tf}
+        for term, tf in terms.items()
+    ])
+
+
+def release_terms(question_ids):
+    """Take many questions out of the document frequencies at once.
+
+    `question_ids` may be a select. Call before deleting their postings.
+    """
+    postings = select(SearchPosting.term).where(SearchPosting.question_ID.in_(question_ids))
+    db.session.execute(
+        SearchTerm.__table__.update()
+        .where(SearchTerm.term.in_(postings))
+        .values(doc_freq=SearchTerm.doc_freq - select(func.count()).where(
+            SearchPosting.term == SearchTerm.term,
+            SearchPosting.question_ID.in_(question_ids)).scalar_subquery()),
+        execution_options={'synchronize_session': False})
+    invalidate_stats()
+
+
+def index_question(question, answers=None):
+    """(Re)index one question. Call before committing the write that changed it."""
+    if question.question_ID is None:
+        db.session.flush()
+    if answers is None:
+        answers = Answer.query.filter_by(question_ID=question.question_ID).all()
+
+    doc_count, _ = _corpus_stats()
+    terms = _document_terms(question, answers)
+    old_terms, old_length = _delete_rows(question.question_ID)
+    _drop_doc_freq(old_terms - terms.keys())
+    _add_doc_freq(terms.keys() - old_terms)
+    if old_length is None:
+        doc_count += 1
+    _adjust_stats(0 if old_length is not None else 1, sum(terms.values()) - (old_length or 0))
+
+    # The norm uses today's IDF; a full rebuild refreshes it as the corpus shifts
+    doc_freq = _doc_freq(terms)
+    norm = math.sqrt(sum(
+        _tfidf_weight(tf, _idf(doc_count, doc_freq.get(term, 1))) ** 2
+        for term, tf in terms.items()
+    ))
+    _write_rows(question, terms, norm)
+
+
+def rebuild(batch_size=500):
+    """Rebuild the whole index from the question and answer tables."""
+    SearchPosting.query.delete(synchronize_session=False)
+    SearchDocument.query.delete(synchronize_session=False)
+    SearchTerm.query.delete(synchronize_session=False)
+    db.session.commit()
+
+    indexed = 0
+    last_id = 0
+    while True:
+        batch = (Question.query.filter(Question.question_ID > last_id)
+                 .order_by(Question.question_ID).limit(batch_size).all())
+        if not batch:
+            break
+        answers = defaultdict(list)
+        for answer in Answer.query.filter(Answer.question_ID.in_([q.question_ID for q in batch])):
+            answers[answer.question_ID].append(answer)
+        for question in batch:
+            # Norms need the final IDF, so they're filled in afterwards
+            _write_rows(question, _document_terms(question, answers[question.question_ID]), 0.0)
+        db.session.commit()
+        indexed += len(batch)
+        last_id = batch[-1].question_ID
+    db.session.execute(insert(SearchTerm).from_select(
+        ['term', 'doc_freq'],
+        select(SearchPosting.term, func.count()).group_by(SearchPosting.term)))
+    db.session.commit()
+    invalidate_stats()
+    _refresh_norms(batch_size)
+    return indexed
+
+
+def _refresh_norms(batch_size):
+    # Second pass of rebuild(): compute every norm against the final IDF
+    doc_count, _ = _corpus_stats()
+    doc_freq = dict(db.session.query(SearchTerm.term, SearchTerm.doc_freq))
+    last_id = 0
+    while True:
+        ids = [row[0] for row in db.session.query(SearchDocument.question_ID)
+               .filter(SearchDocument.question_ID > last_id)
+               .order_by(SearchDocument.question_ID).limit(batch_size)]
+        if not ids:
+            break
+        squares = defaultdict(float)
+        for question_id, term, tf in (db.session.query(SearchPosting.question_ID, SearchPosting.term,
+                                                       SearchPosting.term_freq)
+                                      .filter(SearchPosting.question_ID.in_(ids))):
+            squares[question_id] += _tfidf_weight(tf, _idf(doc_count, doc_freq[term])) ** 2
+        db.session.bulk_update_mappings(SearchDocument, [
+            {'question_ID': qid, 'norm': math.sqrt(squares[qid])} for qid in ids
+        ])
+        db.session.commit()
+        last_id = ids[-1]
+
+
+def invalidate_stats():
+    with _stats_lock:
+        _stats['value'] = None
+
+
+def _adjust_stats(documents, length):
+    # This process's own writes move its cached figures right away (other
+    # workers catch up on their next reload)
+    with _stats_lock:
+        if _stats['value'] is None:
+            return
+        count, avg_length = _stats['value']
+        total = count * avg_length + length
+        count = max(count + documents, 0)
+        _stats['value'] = (count, total / count if count and total > 0 else 1.0)
+
+
+def _corpus_stats():
+    with _stats_lock:
+        value = _stats['value']
+        # An empty corpus isn't cached: the first questions must count at once
+        if not value or not value[0] or time.monotonic() - _stats['loaded_at'] > STATS_TTL:
+            count, avg_length = db.session.query(
+                func.count(SearchDocument.question_ID), func.avg(SearchDocument.length)).one()
+            _stats['value'] = (count or 0, float(avg_length or 0) or 1.0)
+            _stats['loaded_at'] = time.monotonic()
+        return _stats['value']
+
+
+def search(query, subject_id=None, department_id=None, page=1, per_page=PAGE_SIZE):
+    """Rank questions against `query` with BM25.
+
+    Returns (questions, total_hits); questions are ordered best match first.
+    total_hits counts the candidates scored, so it is capped for common terms.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return [], 0
+
+    doc_count, avg_length = _corpus_stats()
+    if not doc_count:
+        return [], 0
+
+    doc_freq = _doc_freq(terms)
+    subject_ids = None
+    if department_id:
+        subject_ids = {s.subject_ID for s in cache.subjects(department_id)}
+    if subject_id:
+        subject_ids = {subject_id} if subject_ids is None else subject_ids & {subject_id}
+    if subject_ids is not None and not subject_ids:
+        return [], 0
+
+    scores = defaultdict(float)
+    for term in terms:
+        if not doc_freq.get(term):
+            continue
+        idf = _idf(doc_count, doc_freq[term])
+        postings = (
+            db.session.query(SearchPosting.question_ID, SearchPosting.term_freq, SearchDocument.length)
+            .join(SearchDocument, SearchDocument.question_ID == SearchPosting.question_ID)
+            .filter(SearchPosting.term == term)
+        )
+        if subject_ids is not None:
+            postings = postings.filter(SearchPosting.subject_ID.in_(sorted(subject_ids)))
+        postings = postings.order_by(SearchPosting.term_freq.desc()).limit(MAX_POSTINGS_PER_TERM)
+        for question_id, tf, length in postings:
+            scores[question_id] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    start = (max(page, 1) - 1) * per_page
+    page_ids = [question_id for question_id, _ in ranked[start:start + per_page]]
+    if not page_ids:
+        return [], len(ranked)
+
+    by_id = {q.question_ID: q for q in
+             Question.query.options(*eager_question_options()).filter(Question.question_ID.in_(page_ids))}
+    return [by_id[qid] for qid in page_ids if qid in by_id], len(ranked)
+
+
+def similar_questions(title, description, subject_id, limit=SIMILAR_LIMIT, min_score=SIMILAR_MIN_SCORE):
+    """Existing questions in the same subject that look like duplicates of a draft.
+
+    Cosine similarity between TF-IDF vectors, computed sparsely from the
+    postings of the draft's own terms. Returns [(question, score)], best first.
+    """
+    draft = Counter()
+    for _ in range(TITLE_WEIGHT):
+        draft.update(tokenize(title))
+    draft.update(tokenize(description))
+    if not draft or not subject_id:
+        return []
+
+    doc_count, _ = _corpus_stats()
+    if not doc_count:
+        return []
+    doc_freq = _doc_freq(draft)
+    idf = {term: _idf(doc_count, doc_freq.get(term, 0)) for term in draft}
+    draft_weights = {term: _tfidf_weight(tf, idf[term]) for term, tf in draft.items()}
+    draft_norm = math.sqrt(sum(w * w for w in draft_weights.values()))
+    if not draft_norm:
+        return []
+
+    # Only the subject's postings are read, at most SIMILAR_POSTINGS_PER_TERM
+    # per term in term-frequency order, straight off ix_search_posting_term_subject
+    dots = defaultdict(float)
+    norms = {}
+    for term in draft:
+        if not doc_freq.get(term):
+            continue
+        postings = (
+            db.session.query(SearchPosting.question_ID, SearchPosting.term_freq, SearchDocument.norm)
+            .join(SearchDocument, SearchDocument.question_ID == SearchPosting.question_ID)
+            .filter(SearchPosting.term == term, SearchPosting.subject_ID == subject_id)
+            .order_by(SearchPosting.term_freq.desc())
+            .limit(SIMILAR_POSTINGS_PER_TERM)
+        )
+        for question_id, tf, norm in postings:
+            dots[question_id] += draft_weights[term] * _tfidf_weight(tf, idf[term])
+            norms[question_id] = norm
+
+    scored = [(qid, dot / (draft_norm * norms[qid])) for qid, dot in dots.items() if norms[qid]]
+    best = sorted((item for item in scored if item[1] >= min_score), key=lambda item: -item[1])[:limit]
+    if not best:
+        return []
+
+    by_id = {q.question_ID: q for q in
+             Question.query.options(*eager_question_options()).filter(Question.question_ID.in_([b[0] for b in best]))}
+    return [(by_id[qid], min(score, 1.0)) for qid, score in best if qid in by_id]
@@ -0,0 +1,127 @@
+// Page values come from data- attributes on this script's tag
+const pageData = document.currentScript.dataset;
+
+// Disable the upvote buttons of answers the student already voted for
+function markVoted(ids) {
+    ids.forEach(id => {
+        document.querySelectorAll(`button[data-answer-id="${id}"][data-url]`).forEach(btn => {
+            btn.disabled = true;
+            btn.title = 'You upvoted this answer';
+        });
+    });
+}
+
+function votedIn(list) {
+    return list && list.dataset.voted ? list.dataset.voted.split(',') : [];
+}
+
+markVoted(votedIn(document.getElementById('questions-list')));
+
+// AJAX upvote handler
+function upvoteBtn(btn) {
+    const url = btn.dataset.url;
+    if (!url) {
+        alert('Upvote URL not found');
+        return;
+    }
+    btn.disabled = true; // optimistic disable
+    fetch(url, {
+        method: 'POST',
+        headers: {
+            'X-Requested-With': 'XMLHttpRequest',
+            'Content-Type': 'application/json'
+        },
+        credentials: 'same-origin'
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data && data.success) {
+            const span = btn.querySelector('.count');
+            if (span) span.innerText = data.count;
+            markVoted([btn.dataset.answerId]);
+        } else if (data && data.message === 'Already upvoted') {
+            markVoted([btn.dataset.answerId]);
+        } else {
+            // show message and re-enable
+            alert((data && data.message) || 'Could not upvote');
+            btn.disabled = false;
+        }
+    })
+    .catch(err => {
+        console.error(err);
+        alert('Network error');
+        btn.disabled = false;
+    });
+}
+
+// Live updates: new questions/answers show a refresh banner, upvote counts update in place
+function showLiveBanner(text) {
+    document.getElementById('live-banner-text').innerText = text;
+    document.getElementById('live-banner').classList.remove('d-none');
+}
+if (window.EventSource) {
+    const live = new EventSource(pageData.eventsUrl);
+    live.addEventListener('question', () => showLiveBanner('New questions have been posted.'));
+    live.addEventListener('answer', e => showLiveBanner('New answer on "' + JSON.parse(e.data).title + '".'));
+    live.addEventListener('upvote', e => {
+        const data = JSON.parse(e.data);
+        document.querySelectorAll(`[data-answer-id="${data.answer_ID}"] .count`).forEach(span => {
+            span.innerText = data.count;
+        });
+    });
+}
+
+// Fetch the next feed page and append its cards in place
+function loadMore(link) {
+    link.classList.add('disabled');
+    fetch(link.href, { credentials: 'same-origin' })
+    .then(response => response.text())
+    .then(html => {
+        const page = new DOMParser().parseFromString(html, 'text/html');
+        const list = document.getElementById('questions-list');
+        page.querySelectorAll('#questions-list > .question-card').forEach(card => {
+            list.appendChild(document.importNode(card, true));
+        });
+        markVoted(votedIn(page.getElementById('questions-list')));
+        const wrap = document.getElementById('load-more-wrap');
+        const next = page.getElementById('load-more-wrap');
+        if (next) {
+            wrap.replaceWith(document.importNode(next, true));
+        } else {
+            wrap.remove();
+        }
+    })
+    .catch(err => {
+        console.error(err);
+        link.classList.remove('disabled');
+    });
+    return false;
+}
+
+// Simple animation for cards on scroll
+function animateOnScroll() {
+    const cards = document.querySelectorAll('.question-card');
+
+    cards.forEach((card, index) => {
+        // Add staggered animation delay
+        card.style.animationDelay = `${index * 0.1}s`;
+    });
+}
+
+// Simple hover effects
+document.querySelectorAll('.question-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+        this.style.boxShadow = '0 15px 35px rgba(0, 0, 0, 0.15)';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+        this.style.boxShadow = '0 5px 20px rgba(0, 0, 0, 0.08)';
+    });
+});
+
+// Initialize animations when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    animateOnScroll();
+});
@@ -0,0 +1,76 @@
+// Page values come from data- attributes on this script's tag
+const pageData = document.currentScript.dataset;
+
+// Live updates: new department announcements show a refresh banner
+if (window.EventSource) {
+    const live = new EventSource(pageData.eventsUrl);
+    live.addEventListener('announcement', e => {
+        document.getElementById('live-banner-text').innerText = 'New announcement: ' + JSON.parse(e.data).title;
+        document.getElementById('live-banner').classList.remove('d-none');
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const announcements = document.querySelectorAll('.announcement-card');
+    const now = new Date();
+
+    // Show/hide "New" badge based on announcement date
+    announcements.forEach(card => {
+        const date = new Date(card.dataset.date);
+        const badge = card.querySelector('.badge-new');
+        const hoursDiff = (now - date) / (1000 * 60 * 60);
+
+        if (badge && hoursDiff > 24) {
+            badge.style.display = 'none';
+        }
+    });
+
+    // Filter announcements
+    document.querySelectorAll('.filter-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            // Update active state
+            document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+
+            const filter = this.dataset.filter;
+            let visibleCount = 0;
+
+            announcements.forEach(card => {
+                const date = new Date(card.dataset.date);
+                const daysDiff = (now - date) / (1000 * 60 * 60 * 24);
+                let shouldShow = false;
+
+                switch(filter) {
+                    case 'latest':
+                        shouldShow = daysDiff <= 1;
+                        break;
+                    case 'week':
+                        shouldShow = daysDiff <= 7;
+                        break;
+                    default: // 'all'
+                        shouldShow = true;
+                }
+
+                card.style.display = shouldShow ? 'block' : 'none';
+                if (shouldShow) visibleCount++;
+            });
+        });
+    });
+
+    // Add smooth scroll reveal
+    const observer = new IntersectionObserver((entries) => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                entry.target.style.opacity = '1';
+                entry.target.style.transform = 'translateX(0)';
+            }
+        });
+    }, {
+        threshold: 0.1,
+        rootMargin: '0px 0px -50px 0px'
+    });
+
+    announcements.forEach(card => {
+        observer.observe(card);
+    });
+});
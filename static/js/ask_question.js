@@ -0,0 +1,51 @@
+// Character counters
+function updateCharCounter(inputId, counterId) {
+    const input = document.getElementById(inputId);
+    const counter = document.getElementById(counterId);
+
+    input.addEventListener('input', function() {
+        counter.textContent = this.value.length;
+
+        // Change color based on usage
+        const percentage = (this.value.length / this.maxLength) * 100;
+        if (percentage > 90) {
+            counter.style.color = '#ef4444';
+        } else if (percentage > 70) {
+            counter.style.color = '#f59e0b';
+        } else {
+            counter.style.color = '#6b7280';
+        }
+    });
+}
+
+// Initialize character counters
+updateCharCounter('titleInput', 'titleCounter');
+updateCharCounter('descriptionInput', 'descriptionCounter');
+
+// Form submission with loading state
+document.getElementById('questionForm').addEventListener('submit', function() {
+    const submitBtn = document.getElementById('submitBtn');
+    submitBtn.classList.add('loading');
+    submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Posting Question...';
+});
+
+// Auto-resize textarea
+document.getElementById('descriptionInput').addEventListener('input', function() {
+    this.style.height = 'auto';
+    this.style.height = Math.max(120, this.scrollHeight) + 'px';
+});
+
+// Form validation feedback
+document.querySelectorAll('.form-control, .form-select').forEach(input => {
+    input.addEventListener('blur', function() {
+        if (this.checkValidity()) {
+            this.style.borderColor = '#10b981';
+        } else {
+            this.style.borderColor = '#ef4444';
+        }
+    });
+
+    input.addEventListener('input', function() {
+        this.style.borderColor = '#e5e7eb';
+    });
+});
@@ -0,0 +1,19 @@
+// Simple animation on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Add staggered animation to cards
+    const cards = document.querySelectorAll('.action-card');
+    cards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.2}s`;
+    });
+});
+
+// Simple hover effects
+document.querySelectorAll('.action-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-8px)';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+});
@@ -0,0 +1,112 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Delete announcement with confirmation
+    document.querySelectorAll('.delete-announcement').forEach(button => {
+        button.addEventListener('click', function() {
+            const id = this.dataset.id;
+            if (confirm('⚠️ Are you sure you want to delete this announcement? This action cannot be undone.')) {
+                fetch(`/faculty/announcement/${id}/delete`, {
+                    method: 'POST',
+                    headers: {
+                        'X-Requested-With': 'XMLHttpRequest'
+                    }
+                })
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success) {
+                        const card = document.getElementById(`announcement-${id}`);
+                        card.style.animation = 'fadeOut 0.5s ease';
+                        setTimeout(() => card.remove(), 500);
+                    } else {
+                        alert('❌ Error deleting announcement: ' + data.message);
+                    }
+                })
+                .catch(error => {
+                    alert('❌ Error: ' + error.message);
+                });
+            }
+        });
+    });
+
+    // Edit announcement - open modal
+    const modal = new bootstrap.Modal(document.getElementById('editAnnouncementModal'));
+
+    document.querySelectorAll('.edit-announcement').forEach(button => {
+        button.addEventListener('click', function() {
+            const id = this.dataset.id;
+            const card = document.getElementById(`announcement-${id}`);
+            const title = card.querySelector('.announcement-title').textContent;
+            const content = card.querySelector('.announcement-content').textContent.trim();
+
+            document.getElementById('edit-announcement-id').value = id;
+            document.getElementById('edit-announcement-title').value = title;
+            document.getElementById('edit-announcement-content').value = content;
+
+            modal.show();
+        });
+    });
+
+    // Save edited announcement
+    document.getElementById('save-edit-announcement').addEventListener('click', function() {
+        const id = document.getElementById('edit-announcement-id').value;
+        const title = document.getElementById('edit-announcement-title').value;
+        const content = document.getElementById('edit-announcement-content').value;
+
+        fetch(`/faculty/announcement/${id}/edit`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify({
+                title: title,
+                content: content
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                const card = document.getElementById(`announcement-${id}`);
+                card.querySelector('.announcement-title').textContent = title;
+                card.querySelector('.announcement-content').textContent = content;
+                modal.hide();
+
+                // Flash effect
+                card.style.animation = 'pulse 0.5s ease';
+                setTimeout(() => card.style.animation = '', 500);
+            } else {
+                alert('❌ Error updating announcement: ' + data.message);
+            }
+        })
+        .catch(error => {
+            alert('❌ Error: ' + error.message);
+        });
+    });
+
+    // Hover effects
+    document.querySelectorAll('.announcement-card').forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
+
+// Add fadeOut animation for delete
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes fadeOut {
+        to {
+            opacity: 0;
+            transform: translateX(-20px);
+        }
+    }
+    @keyframes pulse {
+        50% {
+            background: rgba(16, 185, 129, 0.1);
+        }
+    }
+`;
+document.head.appendChild(style);
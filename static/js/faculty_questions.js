@@ -0,0 +1,55 @@
+// Character counters for textareas
+document.querySelectorAll('textarea[id^="answer-"]').forEach(textarea => {
+    const questionId = textarea.id.split('-')[1];
+    const counter = document.getElementById(`counter-${questionId}`);
+
+    textarea.addEventListener('input', function() {
+        counter.textContent = this.value.length;
+
+        // Change color based on usage
+        const percentage = (this.value.length / this.maxLength) * 100;
+        if (percentage > 90) {
+            counter.style.color = '#ef4444';
+        } else if (percentage > 70) {
+            counter.style.color = '#f59e0b';
+        } else {
+            counter.style.color = '#6b7280';
+        }
+    });
+});
+
+// Form submission with loading state
+document.querySelectorAll('.answer-form-element').forEach(form => {
+    form.addEventListener('submit', function() {
+        const btn = this.querySelector('.btn-submit');
+        btn.classList.add('loading');
+        btn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Submitting Answer...';
+    });
+});
+
+// Auto-resize textareas
+document.querySelectorAll('textarea').forEach(textarea => {
+    textarea.addEventListener('input', function() {
+        this.style.height = 'auto';
+        this.style.height = Math.max(100, this.scrollHeight) + 'px';
+    });
+});
+
+// Simple card animations
+document.addEventListener('DOMContentLoaded', function() {
+    const cards = document.querySelectorAll('.question-card');
+    cards.forEach((card, index) => {
+        card.style.animationDelay = `${index * 0.1}s`;
+    });
+});
+
+// Hover effects
+document.querySelectorAll('.question-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+});
@@ -0,0 +1,31 @@
+// Simple animations on page load
+document.addEventListener('DOMContentLoaded', function() {
+    // Add hover effects to faculty cards
+    document.querySelectorAll('.faculty-card').forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-8px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Animate numbers counting up (for top score)
+    const statNumbers = document.querySelectorAll('.stat-card-number, .reputation-number');
+    statNumbers.forEach(num => {
+        const finalValue = parseInt(num.textContent);
+        if (finalValue > 0) {
+            let currentValue = 0;
+            const increment = Math.ceil(finalValue / 50);
+            const timer = setInterval(() => {
+                currentValue += increment;
+                if (currentValue >= finalValue) {
+                    currentValue = finalValue;
+                    clearInterval(timer);
+                }
+                num.textContent = currentValue;
+            }, 20);
+        }
+    });
+});
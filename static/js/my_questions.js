@@ -0,0 +1,42 @@
+// Page values come from data- attributes on this script's tag
+const pageData = document.currentScript.dataset;
+
+// Live updates: tell the student when one of their questions gets answered
+if (window.EventSource) {
+    const live = new EventSource(pageData.eventsUrl);
+    live.addEventListener('answer', e => {
+        const data = JSON.parse(e.data);
+        if (data.student_ID === Number(pageData.userId)) {
+            document.getElementById('live-banner-text').innerText = 'Your question "' + data.title + '" has a new answer!';
+            document.getElementById('live-banner').classList.remove('d-none');
+        }
+    });
+}
+
+// Simple animation for cards on scroll
+function animateOnScroll() {
+    const cards = document.querySelectorAll('.question-card');
+
+    cards.forEach((card, index) => {
+        // Add staggered animation delay
+        card.style.animationDelay = `${index * 0.1}s`;
+    });
+}
+
+// Simple hover effects
+document.querySelectorAll('.question-card').forEach(card => {
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+        this.style.boxShadow = '0 15px 35px rgba(0, 0, 0, 0.15)';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+        this.style.boxShadow = '0 5px 20px rgba(0, 0, 0, 0.08)';
+    });
+});
+
+// Initialize animations when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    animateOnScroll();
+});
@@ -0,0 +1,89 @@
+// Enhanced subject dropdown toggle with animations
+function toggleSubjectDropdown() {
+    const role = document.getElementById("roleSelect").value;
+    const subjectDiv = document.getElementById("subjectDiv");
+    const roleIndicator = document.getElementById("roleIndicator");
+    const selectElement = document.getElementById("roleSelect");
+
+    // Add role switch animation
+    selectElement.classList.add('role-animation');
+    setTimeout(() => selectElement.classList.remove('role-animation'), 500);
+
+    if (role === "faculty") {
+        subjectDiv.style.display = "block";
+        subjectDiv.classList.add('show');
+
+        // Update role indicator
+        roleIndicator.className = "role-indicator faculty-indicator";
+        roleIndicator.innerHTML = '<i class="fas fa-chalkboard-teacher"></i>';
+
+        setTimeout(() => {
+            subjectDiv.style.maxHeight = subjectDiv.scrollHeight + "px";
+        }, 10);
+    } else {
+        subjectDiv.classList.remove('show');
+        subjectDiv.style.maxHeight = "0px";
+
+        // Update role indicator
+        roleIndicator.className = "role-indicator student-indicator";
+        roleIndicator.innerHTML = '<i class="fas fa-user-graduate"></i>';
+
+        setTimeout(() => {
+            subjectDiv.style.display = "none";
+        }, 300);
+    }
+}
+
+// Form submission with loading state
+document.getElementById('registrationForm').addEventListener('submit', function() {
+    const btn = document.getElementById('registerBtn');
+    btn.classList.add('loading');
+    btn.innerHTML = '<span>🚀 Creating Account...</span>';
+});
+
+// Form validation animations
+document.querySelectorAll('.form-control, .form-select').forEach(input => {
+    input.addEventListener('focus', function() {
+        this.parentElement.classList.add('focused');
+    });
+
+    input.addEventListener('blur', function() {
+        if (!this.value) {
+            this.parentElement.classList.remove('focused');
+        }
+    });
+
+    // Real-time validation feedback
+    input.addEventListener('input', function() {
+        if (this.checkValidity()) {
+            this.classList.remove('is-invalid');
+            this.classList.add('is-valid');
+        } else {
+            this.classList.remove('is-valid');
+            this.classList.add('is-invalid');
+        }
+    });
+});
+
+// Auto-dismiss flash messages
+setTimeout(function() {
+    document.querySelectorAll('.alert').forEach(alert => {
+        const bsAlert = new bootstrap.Alert(alert);
+        bsAlert.close();
+    });
+}, 5000);
+
+// Add entrance animations to form elements
+document.addEventListener('DOMContentLoaded', function() {
+    const formGroups = document.querySelectorAll('.form-group');
+    formGroups.forEach((group, index) => {
+        group.style.opacity = '0';
+        group.style.transform = 'translateY(20px)';
+        group.style.transition = 'all 0.5s ease';
+
+        setTimeout(() => {
+            group.style.opacity = '1';
+            group.style.transform = 'translateY(0)';
+        }, index * 100 + 200);
+    });
+});
@@ -0,0 +1,191 @@
+from datetime import datetime
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from models import db, User, Question, Announcement, FacultySubject, UserSummary
+import cache
+
+# ---------------------------
+# Per-user dashboard summaries
+# ---------------------------
+# One user_summary row per user holds the counts the dashboards show. Write
+# routes adjust the affected rows with set-based UPDATEs in their own
+# transaction (question_asked, question_answered, announcement_posted).
+# Bulk changes (deletes, archiving, imports) mark rows stale instead, and a
+# stale or missing row is recomputed on the user's next visit.
+# Rebuild every row with: flask --app app rebuild-summaries
+
+RECENT_LIMIT = 5
+
+
+def _faculty_of_subject(subject_id):
+    return select(FacultySubject.faculty_ID).where(FacultySubject.subject_ID == subject_id)
+
+
+# ---------- Reads ----------
+def _compute(user):
+    """(open, answered) question counts for one user, from the live tables."""
+    if user.role == 'faculty':
+        subject_ids = cache.faculty_subject_ids(user.user_ID)
+        scope = Question.subject_ID.in_(subject_ids) if subject_ids else None
+    else:
+        scope = Question.student_ID == user.user_ID
+    if scope is None:
+        return 0, 0
+    rows = db.session.query(Question.is_answered, func.count()).filter(scope).group_by(Question.is_answered)
+    counts = _tally((None, is_answered, n) for is_answered, n in rows).get(None, {})
+    return counts.get(False, 0), counts.get(True, 0)
+
+
+def _tally(rows):
+    # (key, is_answered, n) -> {key: {False: open, True: answered}}; NULL counts as open
+    tally = {}
+    for key, is_answered, n in rows:
+        bucket = tally.setdefault(key, {False: 0, True: 0})
+        bucket[bool(is_answered)] += n
+    return tally
+
+
+def _unread(user, seen_at):
+    if not user.department_ID:
+        return 0
+    query = Announcement.query.filter(Announcement.department_ID == user.department_ID,
+                                      Announcement.faculty_ID != user.user_ID)
+    if seen_at is not None:
+        query = query.filter(Announcement.created_at > seen_at)
+    return query.count()
+
+
+def get(user):
+    """The user's summary row. Missing or stale rows are recomputed (and committed) here."""
+    # Always from the primary: this row is written on read pages too
+    primary = {'bind': db.engine}
+    summary = db.session.get(UserSummary, user.user_ID, bind_arguments=primary)
+    if summary is not None and not summary.stale:
+        return summary
+
+    open_, answered = _compute(user)
+    if summary is None:
+        summary = UserSummary(user_ID=user.user_ID)
+        try:
+            with db.session.begin_nested():
+                db.session.add(summary)
+        except IntegrityError:
+            # Another request created it first
+            summary = db.session.get(UserSummary, user.user_ID, populate_existing=True,
+                                     bind_arguments=primary)
+    summary.open_questions = open_
+    summary.answered_questions = answered
+    summary.unread_announcements = _unread(user, summary.announcements_seen_at)
+    summary.stale = False
+    summary.updated_at = datetime.utcnow()
+    db.session.commit()
+    return summary
+
+
+def recent_questions(user, limit=RECENT_LIMIT):
+    """The newest few questions for the dashboard preview (capped, index-ordered)."""
+    if user.role == 'faculty':
+        subject_ids = cache.faculty_subject_ids(user.user_ID)
+        if not subject_ids:
+            return []
+        query = Question.query.filter(Question.subject_ID.in_(subject_ids))
+    else:
+        query = Question.query.filter(Question.student_ID == user.user_ID)
+    return query.order_by(Question.created_at.desc()).limit(limit).all()
+
+
+# ---------- Incremental updates (call before committing the write) ----------
+def _adjust(user_filter, **deltas):
+    values = {getattr(UserSummary, name): getattr(UserSummary, name) + delta for name, delta in deltas.items()}
+    db.session.execute(update(UserSummary).where(user_filter).values(values),
+                       execution_options={'synchronize_session': False})
+
+
+def question_asked(question):
+    _adjust(db.or_(UserSummary.user_ID == question.student_ID,
+                   UserSummary.user_ID.in_(_faculty_of_subject(question.subject_ID))),
+            open_questions=1)
+
+
+def question_answered(question):
+    """A question's first answer: it moves from open to answered."""
+    _adjust(db.or_(UserSummary.user_ID == question.student_ID,
+                   UserSummary.user_ID.in_(_faculty_of_subject(question.subject_ID))),
+            open_questions=-1, answered_questions=1)
+
+
+def announcement_posted(announcement):
+    department_users = select(User.user_ID).where(User.department_ID == announcement.department_ID,
+                                                  User.user_ID != announcement.faculty_ID)
+    _adjust(UserSummary.user_ID.in_(department_users), unread_announcements=1)
+
+
+def mark_announcements_read(user):
+    """Call when the user is shown their department's announcements; the caller commits."""
+    summary = get(user)
+    summary.unread_announcements = 0
+    summary.announcements_seen_at = datetime.utcnow()
+
+
+# ---------- Bulk invalidation ----------
+def _mark_stale(user_filter):
+    db.session.execute(update(UserSummary).where(user_filter).values(stale=True),
+                       execution_options={'synchronize_session': False})
+
+
+def invalidate_users(user_ids):
+    if user_ids:
+        _mark_stale(UserSummary.user_ID.in_(list(user_ids)))
+
+
+def invalidate_subjects(subject_ids):
+    """Faculty teaching these subjects."""
+    if subject_ids:
+        _mark_stale(UserSummary.user_ID.in_(
+            select(FacultySubject.faculty_ID).where(FacultySubject.subject_ID.in_(list(subject_ids)))))
+
+
+def invalidate_department(department_id):
+    _mark_stale(UserSummary.user_ID.in_(select(User.user_ID).where(User.department_ID == department_id)))
+
+
+def invalidate_all():
+    _mark_stale(db.true())
+
+
+# ---------- Full rebuild ----------
+def rebuild(chunk_size=2000):
+    """Recompute every user's row with a few grouped queries. Returns rows written."""
+    student_counts = _tally(db.session.query(Question.student_ID, Question.is_answered, func.count())
+                            .group_by(Question.student_ID, Question.is_answered))
+    faculty_counts = _tally(db.session.query(FacultySubject.faculty_ID, Question.is_answered, func.count())
+                            .join(Question, Question.subject_ID == FacultySubject.subject_ID)
+                            .group_by(FacultySubject.faculty_ID, Question.is_answered))
+    seen = dict(db.session.query(UserSummary.user_ID, UserSummary.announcements_seen_at))
+    announcements = {}
+    for department_id, faculty_id, created_at in db.session.query(
+            Announcement.department_ID, Announcement.faculty_ID, Announcement.created_at):
+        announcements.setdefault(department_id, []).append((faculty_id, created_at))
+
+    now = datetime.utcnow()
+    rows = []
+    for user_id, role, department_id in db.session.query(User.user_ID, User.role, User.department_ID):
+        counts = (faculty_counts if role == 'faculty' else student_counts).get(user_id, {})
+        seen_at = seen.get(user_id)
+        unread = sum(1 for faculty_id, created_at in announcements.get(department_id, [])
+                     if faculty_id != user_id and (seen_at is None or (created_at and created_at > seen_at)))
+        rows.append({'uid': user_id, 'open': counts.get(False, 0), 'answered': counts.get(True, 0),
+                     'unread': unread, 'seen_at': seen_at, 'now': now})
+
+    table = UserSummary.__table__
+    db.session.execute(table.delete())
+    for start in range(0, len(rows), chunk_size):
+        db.session.execute(table.insert().values(
+            user_ID=bindparam('uid'), open_questions=bindparam('open'),
+            answered_questions=bindparam('answered'), unread_announcements=bindparam('unread'),
+            announcements_seen_at=bindparam('seen_at'), stale=False, updated_at=bindparam('now')),
+            rows[start:start + chunk_size])
+    db.session.commit()
+    return len(rows)
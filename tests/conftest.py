@@ -0,0 +1,96 @@
+import os
+import sys
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from models import db, User, Department, Subject, FacultySubject
+import cache
+import fragments
+import hot
+import leaderboard_cache
+import search
+import votes
+
+PASSWORD = 'pw'
+
+
+def _reset_process_caches():
+    cache.users.clear()
+    cache.lookups.clear()
+    fragments._fragments.clear()
+    leaderboard_cache.invalidate()
+    hot.invalidate()
+    votes.forget()
+    search.invalidate_stats()
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SECRET_KEY': 'test',
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+        'SQLALCHEMY_BINDS': {},
+        'JOB_WORKERS': 0,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    if not os.path.isdir(os.path.join(app.root_path, 'templates')):
+        # Templates sit next to app.py in this checkout
+        app.template_folder = app.root_path
+    _reset_process_caches()
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+    _reset_process_caches()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def department(app):
+    with app.app_context():
+        dept = Department(name='CSE')
+        db.session.add(dept)
+        db.session.commit()
+        return dept.department_ID
+
+
+@pytest.fixture
+def subject(app, department):
+    with app.app_context():
+        subj = Subject(name='DBMS', department_ID=department)
+        db.session.add(subj)
+        db.session.commit()
+        return subj.subject_ID
+
+
+@pytest.fixture
+def make_user(app):
+    # make_user('fac', 'faculty', department_id, subject_ids=[...]) -> user_ID
+    def make(username, role, department_id=None, subject_ids=()):
+        with app.app_context():
+            user = User(username=username, password_hash=generate_password_hash(PASSWORD, 'pbkdf2:sha256:1000'),
+                        role=role, department_ID=department_id, reputation_points=0)
+            db.session.add(user)
+            db.session.flush()
+            for subject_id in subject_ids:
+                db.session.add(FacultySubject(faculty_ID=user.user_ID, subject_ID=subject_id))
+            db.session.commit()
+            return user.user_ID
+    return make
+
+
+def login(client, username):
+    response = client.post('/login', data={'username': username, 'password': PASSWORD})
+    assert response.status_code == 302, response.status_code
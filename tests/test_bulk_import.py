@@ -0,0 +1,18 @@
+import json
+
+from models import User
+import bulk_import
+import passwords
+
+
+def test_imported_passwords_use_the_configured_method(app, tmp_path):
+    path = tmp_path / 'users.jsonl'
+    path.write_text(json.dumps({'username': 'imported', 'password': 'pw', 'role': 'student'}) + '\n')
+    passwords.configure('pbkdf2:sha256:1000', workers=0, queue=0)
+    try:
+        with app.app_context():
+            assert bulk_import.import_file('user', str(path), workers=1) == 1
+            password_hash = User.query.filter_by(username='imported').one().password_hash
+    finally:
+        passwords.configure(workers=0, queue=0)
+    assert password_hash.startswith('pbkdf2:sha256:1000$')
@@ -0,0 +1,31 @@
+import pytest
+
+from app import create_app
+import config
+
+
+@pytest.fixture
+def bare_env(monkeypatch):
+    for name in ('SECRET_KEY', 'DATABASE_URL', 'FLASK_DEBUG'):
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_production_requires_secret_key_and_database_url(bare_env):
+    with pytest.raises(config.ConfigError, match='SECRET_KEY and DATABASE_URL'):
+        create_app()
+
+
+def test_production_starts_with_both_set(bare_env, monkeypatch):
+    monkeypatch.setenv('SECRET_KEY', 's3cret')
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    app = create_app()
+    assert app.config['SECRET_KEY'] == 's3cret'
+    assert app.config['SQLALCHEMY_DATABASE_URI'] == 'sqlite://'
+
+
+def test_debug_and_testing_fall_back_to_development_values():
+    for flag in ('DEBUG', 'TESTING'):
+        settings = {flag: True, 'SECRET_KEY': None}
+        config.check(settings)
+        assert settings['SECRET_KEY'] == config.DEV_SECRET_KEY
+        assert settings['SQLALCHEMY_DATABASE_URI'] == config.DEFAULT_DATABASE_URL
@@ -0,0 +1,16 @@
+from conftest import login
+
+
+def test_faculty_without_department_cannot_export(client, make_user):
+    make_user('fac', 'faculty', department_id=None)
+    login(client, 'fac')
+    for resource in ('questions', 'answers', 'upvotes', 'leaderboard'):
+        response = client.get(f'/api/v1/export/{resource}')
+        assert response.status_code == 403
+
+
+def test_faculty_export_is_limited_to_own_department(client, department, make_user):
+    make_user('fac', 'faculty', department_id=department)
+    login(client, 'fac')
+    assert client.get('/api/v1/export/questions').status_code == 200
+    assert client.get(f'/api/v1/export/questions?department={department + 1}').status_code == 403
@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import login
+from models import db, Question, Answer, Upvote
+import hot
+import moderation
+import votes
+
+
+def _ask(app, student_id, subject_id, count):
+    with app.app_context():
+        questions = [Question(title=f'Question {i}', description='How do joins work?',
+                              student_ID=student_id, subject_ID=subject_id) for i in range(count)]
+        db.session.add_all(questions)
+        db.session.commit()
+        return [q.question_ID for q in questions]
+
+
+def test_deleting_one_question_keeps_the_hot_ranking_loaded(app, department, subject, make_user):
+    question_ids = _ask(app, make_user('stu', 'student', department), subject, 3)
+    with app.app_context():
+        assert sorted(hot.page()[0]) == question_ids
+        moderation.delete_questions([question_ids[0]])
+        db.session.commit()
+        assert hot._state['loaded_at'] is not None
+        assert sorted(hot.page()[0]) == question_ids[1:]
+
+
+def test_purging_a_subject_reloads_the_hot_ranking(app, department, subject, make_user):
+    _ask(app, make_user('stu', 'student', department), subject, 2)
+    with app.app_context():
+        hot.page()
+        moderation.purge_subject(subject)
+        db.session.commit()
+        assert hot._state['loaded_at'] is None
+        assert hot.page() == ([], 0)
+
+
+@pytest.mark.parametrize('url, body', [
+    ('/admin/moderation/questions', {'question_ids': ['abc']}),
+    ('/admin/moderation/questions', {'question_ids': 5}),
+    ('/admin/moderation/questions', {'subject_id': 'x'}),
+    ('/admin/moderation/questions', {'subject_id': True}),
+    ('/admin/moderation/questions', {}),
+    ('/admin/moderation/questions', [1, 2]),
+    ('/admin/moderation/announcements', {'announcement_ids': [None]}),
+    ('/admin/moderation/announcements', {'department_id': [1]}),
+])
+def test_moderation_rejects_bad_input(client, make_user, url, body):
+    make_user('adm', 'admin')
+    login(client, 'adm')
+    response = client.post(url, json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_moderation_deletes_questions_by_id(app, client, department, subject, make_user):
+    question_ids = _ask(app, make_user('stu', 'student', department), subject, 2)
+    make_user('adm', 'admin')
+    login(client, 'adm')
+    response = client.post('/admin/moderation/questions', json={'question_ids': [str(question_ids[0])]})
+    assert response.status_code == 200
+    assert response.get_json()['deleted']['question'] == 1
+
+
+def test_deleting_a_question_forgets_its_upvotes(app, department, subject, make_user):
+    student_id = make_user('stu', 'student', department)
+    faculty_id = make_user('fac', 'faculty', department, subject_ids=[subject])
+    question_id = _ask(app, student_id, subject, 1)[0]
+    with app.app_context():
+        answer = Answer(question_ID=question_id, faculty_ID=faculty_id, content='Like this', upvote_count=1)
+        db.session.add(answer)
+        db.session.flush()
+        db.session.add(Upvote(answer_ID=answer.answer_ID, user_ID=student_id))
+        db.session.commit()
+        answer_id = answer.answer_ID
+        assert votes.has_voted(student_id, answer_id)
+
+        moderation.delete_questions([question_id])
+        db.session.commit()
+        assert not votes.has_voted(student_id, answer_id)
@@ -0,0 +1,20 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+import passwords
+
+
+@pytest.mark.parametrize('method', ['scrypt', 'scrypt:16384:8:1', 'pbkdf2', 'pbkdf2:sha256',
+                                    'pbkdf2:sha256:1000', 'pbkdf2:sha512'])
+def test_needs_rehash_matches_werkzeug_expansion(method):
+    passwords.configure(method, workers=0, queue=0)
+    try:
+        assert not passwords.needs_rehash(generate_password_hash('pw', method))
+        assert passwords.needs_rehash(generate_password_hash('pw', 'pbkdf2:sha256:1'))
+    finally:
+        passwords.configure(workers=0, queue=0)
+
+
+def test_unknown_method_fails_at_configure():
+    with pytest.raises(ValueError):
+        passwords.configure('md5', workers=0, queue=0)
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from conftest import login
+from models import db, Question, Answer, Upvote
+import fragments
+import hot
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def _add_questions(app, count, student_id, faculty_id, voter_id, subject_id):
+    with app.app_context():
+        for i in range(count):
+            question = Question(title=f'Question {i}', description='How do joins work?',
+                                student_ID=student_id, subject_ID=subject_id, is_answered=True)
+            db.session.add(question)
+            db.session.flush()
+            for _ in range(2):
+                answer = Answer(question_ID=question.question_ID, faculty_ID=faculty_id,
+                                content='Like this', upvote_count=1)
+                db.session.add(answer)
+                db.session.flush()
+                db.session.add(Upvote(answer_ID=answer.answer_ID, user_ID=voter_id))
+        db.session.commit()
+
+
+def _query_count(client, url):
+    fragments._fragments.clear()  # render every card, as on a cold cache
+    hot.invalidate()
+    response = client.get(url)
+    assert response.status_code == 200
+    return int(_QUERIES_RE.search(response.headers['Server-Timing']).group(1))
+
+
+@pytest.mark.parametrize('url', ['/faculty/questions', '/faculty/questions?sort=hot'])
+def test_faculty_questions_query_count_is_constant(app, client, department, subject, make_user, url):
+    student_id = make_user('stu', 'student', department)
+    voter_id = make_user('stu2', 'student', department)
+    faculty_id = make_user('fac', 'faculty', department, subject_ids=[subject])
+    login(client, 'fac')
+
+    _add_questions(app, 3, student_id, faculty_id, voter_id, subject)
+    client.get(url)  # warm the user and lookup caches
+    small = _query_count(client, url)
+
+    _add_questions(app, 40, student_id, faculty_id, voter_id, subject)
+    large = _query_count(client, url)
+
+    assert small == large
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from models import db, ContentVersion
+import assets
+
+# ---------------------------
+# Conditional GET (ETag / Last-Modified)
+# ---------------------------
+# Write routes call bump_*() before committing, so a version changes in the
+# same transaction as the data it covers. Read routes look up the version of
+# the scopes they show (one small query) and answer If-None-Match /
+# If-Modified-Since with a 304 before running the page's queries or
+# rendering anything.
+
+DEPARTMENT = 'department'
+SUBJECT = 'subject'
+
+_template_stamp = None
+
+
+# ---------- Writes ----------
+def bump(scope, scope_id):
+    """Advance one scope's version inside the current transaction."""
+    if scope_id is None:
+        return
+    now = datetime.utcnow()
+    updated = ContentVersion.query.filter_by(scope=scope, scope_ID=scope_id).update(
+        {ContentVersion.version: ContentVersion.version + 1, ContentVersion.updated_at: now},
+        synchronize_session=False)
+    if updated:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(ContentVersion(scope=scope, scope_ID=scope_id, version=1, updated_at=now))
+    except IntegrityError:
+        # Another request created the row first
+        bump(scope, scope_id)
+
+
+def bump_subject(subject_id):
+    bump(SUBJECT, int(subject_id) if subject_id is not None else None)
+
+
+def bump_department(department_id):
+    bump(DEPARTMENT, department_id)
+
+
+def bump_all(scope, scope_ids):
+    """For bulk writes (imports, reconcile) that touch many scopes at once."""
+    for scope_id in scope_ids:
+        bump(scope, scope_id)
+
+
+# ---------- Reads ----------
+def fingerprint(scope, scope_ids=None):
+    """(version, last_modified) over one scope, optionally limited to some IDs."""
+    query = db.session.query(func.coalesce(func.sum(ContentVersion.version), 0),
+                             func.max(ContentVersion.updated_at)).filter(ContentVersion.scope == scope)
+    if scope_ids is not None:
+        query = query.filter(ContentVersion.scope_ID.in_(list(scope_ids)))
+    version, last_modified = query.one()
+    return int(version), last_modified
+
+
+def _templates_changed_at():
+    # A deploy that changes templates must not keep serving 304s
+    global _template_stamp
+    if _template_stamp is None:
+        root = os.path.join(current_app.root_path, current_app.template_folder or 'templates')
+        mtimes = [os.path.getmtime(os.path.join(root, name))
+                  for name in os.listdir(root)] if os.path.isdir(root) else []
+        _template_stamp = int(max(mtimes, default=0))
+    return _template_stamp
+
+
+def conditional(scope, scope_ids, render):
+    """Return a 304 if the client's copy is current, else render() with validators.
+
+    The ETag covers the scope version, the user (pages show their name and
+    role-specific buttons) and the full URL, so it is only ever reused by the
+    same user for the same page.
+    """
+    version, last_modified = fingerprint(scope, scope_ids)
+    user_id = current_user.get_id() if current_user.is_authenticated else None
+    raw = f'{scope}:{version}:{user_id}:{request.full_path}:{_templates_changed_at()}:{assets.build_id()}'
+    etag = hashlib.sha1(raw.encode()).hexdigest()[:20]
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+
+    # Pending flash messages are shown once, so the page must be rendered
+    fresh = False
+    if not session.get('_flashes'):
+        if request.if_none_match:
+            fresh = request.if_none_match.contains_weak(etag)
+        elif request.if_modified_since and last_modified is not None:
+            fresh = last_modified <= request.if_modified_since
+
+    if fresh:
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render())
+        if last_modified is not None:
+            response.last_modified = last_modified
+    # Weak: the same page may go out gzipped or not (assets.py)
+    response.set_etag(etag, weak=True)
+    # Browsers keep the page but revalidate it on every visit
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,62 @@
+from sqlalchemy import select
+
+from models import db, Upvote
+from cache import LRUCache
+
+# ---------------------------
+# Has-voted index
+# ---------------------------
+# Per-process set of answer IDs each student has upvoted, loaded with one
+# indexed query (the unique user_ID, answer_ID index) the first time it's
+# needed and added to on every vote. Repeat votes are turned away on a hit
+# without touching the database, and the feed marks a page's voted buttons
+# with set lookups. Votes are only removed along with their answers
+# (moderation.py, which archiving also goes through), and that forgets the
+# voters' sets in the worker that did it. Other workers keep a stale hit for
+# the deleted answer until VOTES_TTL runs out; nobody can vote on it then
+# anyway. A miss can be stale too (the vote went through another worker);
+# the unique index still rejects that insert, and the set learns it then.
+#
+# Plain sets rather than bitmaps or Bloom filters: a student's votes are few
+# and sparse across answer IDs, and a set answers exactly.
+
+MAX_VOTERS = 4096
+VOTES_TTL = 900  # seconds; bounds how stale a miss can be after deletes/restores
+
+_voted = LRUCache(MAX_VOTERS, VOTES_TTL)
+
+
+def voted_answers(user_id):
+    """The set of answer IDs this user has upvoted (loaded on first use)."""
+    voted = _voted.get(user_id)
+    if voted is None:
+        voted = set(db.session.execute(select(Upvote.answer_ID).where(Upvote.user_ID == user_id)).scalars())
+        _voted.set(user_id, voted)
+    return voted
+
+
+def has_voted(user_id, answer_id):
+    return answer_id in voted_answers(user_id)
+
+
+def record(user_id, answer_id):
+    """Call once a vote is known to exist (committed, or rejected as a duplicate)."""
+    voted = _voted.get(user_id)
+    if voted is not None:
+        voted.add(answer_id)
+
+
+def voted_on_page(user, questions):
+    """Answer IDs on these questions the user has already upvoted (students only)."""
+    if not user.is_authenticated or user.role != 'student':
+        return []
+    voted = voted_answers(user.user_ID)
+    return sorted(a.answer_ID for q in questions for a in q.answers if a.answer_ID in voted)
+
+
+def forget(user_id=None):
+    """Drop one user's cached set (or everyone's) so it reloads on next use."""
+    if user_id is None:
+        _voted.clear()
+    else:
+        _voted.delete(user_id)
@@ -0,0 +1,10 @@
+from app import create_app
+
+# ---------------------------
+# Production entry point
+# ---------------------------
+# gunicorn -c gunicorn.conf.py wsgi:app
+# Run `flask --app app db-upgrade` once per deploy first; the app itself
+# never creates or alters tables.
+
+app = create_app()